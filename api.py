@@ -0,0 +1,170 @@
+import json
+import zlib
+from datetime import datetime, timedelta
+from flask import Response, request, stream_with_context
+from sqlalchemy import func
+from werkzeug.http import is_resource_modified
+from cache import content_version, version_timestamp
+from models import db, ContentChange
+
+try:
+    import brotli
+except ImportError:  # isteğe bağlı; kurulu değilse sadece gzip sunulur
+    brotli = None
+
+# Sıkıştırılmış yanıtlar worker içi önbellekte tutulur; çok büyükleri akıtılır ama saklanmaz
+API_CACHE_MAX_BYTES = 4 * 1024 * 1024
+# Akış sırasında tek parçada birleştirilen kayıt sayısı
+STREAM_BATCH = 200
+
+
+# --- Değişiklik kaydı ('since' parametresi) ---
+
+def change_version():
+    return db.session.query(func.max(ContentChange.id)).scalar() or 0
+
+
+def since_arg():
+    since = request.args.get('since', type=int)
+    if not since or since < 0:
+        return None
+    # Budanmış kayıtların öncesinden bir sürüm istenirse tam liste gerekir
+    oldest = db.session.query(func.min(ContentChange.id)).scalar()
+    if oldest is None or since < oldest - 1:
+        return None
+    return since
+
+
+def changed_ids(table_name, since, version):
+    rows = (
+        db.session.query(ContentChange.row_id)
+        .filter(ContentChange.table_name == table_name,
+                ContentChange.id > since, ContentChange.id <= version)
+        .distinct()
+        .order_by(ContentChange.row_id)
+    )
+    return [row_id for row_id, in rows]
+
+
+# Eski değişiklik kayıtlarını siler; son kayıt sürüm sayacı olarak hep kalır.
+# Budanan aralıktan 'since' gönderen istemciler tam liste alır.
+def prune_changes(keep_days=7):
+    cutoff = datetime.now() - timedelta(days=keep_days)
+    latest = change_version()
+    deleted = ContentChange.query.filter(
+        ContentChange.changed_at < cutoff, ContentChange.id < latest
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+# Değişen kayıtları parça parça yükler (SQLite parametre sınırına takılmadan)
+def rows_by_id(model, ids, batch_size=500):
+    for i in range(0, len(ids), batch_size):
+        yield from model.query.filter(model.id.in_(ids[i:i + batch_size])).order_by(model.id)
+
+
+# --- Akışlı JSON ve sıkıştırma ---
+
+# fields: (ad, değer) çiftleri. Değer bir üreteçse dizi olarak parça parça
+# yazılır; çağrılabilir ise sırası geldiğinde çağrılır (örn. akış sonunda
+# bilinen 'deleted' listesi)
+def iter_json(fields):
+    yield '{'
+    for n, (name, value) in enumerate(fields):
+        yield ('' if n == 0 else ',') + json.dumps(name) + ':'
+        if callable(value):
+            value = value()
+        if value is None or isinstance(value, (dict, list, str, int, float, bool)):
+            yield json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+            continue
+        yield '['
+        batch, first = [], True
+        for item in value:
+            batch.append(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+            if len(batch) >= STREAM_BATCH:
+                yield ('' if first else ',') + ','.join(batch)
+                batch, first = [], False
+        if batch:
+            yield ('' if first else ',') + ','.join(batch)
+        yield ']'
+    yield '}'
+
+
+def negotiate_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br'] and accepted['br'] >= accepted['gzip']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=5)
+        elif encoding == 'gzip':
+            self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        if self.encoding == 'br':
+            return self._compressor.process(data)
+        if self.encoding == 'gzip':
+            return self._compressor.compress(data)
+        return data
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        if self.encoding == 'gzip':
+            return self._compressor.flush()
+        return b''
+
+
+def _encoded_chunks(chunks, encoding, on_complete):
+    compressor = _Compressor(encoding)
+    parts, size = [], 0
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            if parts is not None:
+                parts.append(data)
+                size += len(data)
+                if size > API_CACHE_MAX_BYTES:
+                    parts = None
+            yield data
+    data = compressor.finish()
+    if parts is not None:
+        parts.append(data)
+        on_complete(b''.join(parts))
+    yield data
+
+
+# Sürüm tabanlı ETag ile 304, önbellekte varsa hazır sıkıştırılmış gövde,
+# yoksa fields_factory() ile üretilen JSON akıtılır (ve bitince önbelleğe alınır)
+def json_api_response(cache, fields_factory):
+    version = content_version()
+    encoding = negotiate_encoding()
+    etag = '%s-%x-%s' % (version, zlib.crc32(request.full_path.encode('utf-8')), encoding or 'identity')
+    last_modified = version_timestamp(version)
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+    else:
+        key = (request.full_path, encoding)
+        body = cache.get(version, key)
+        if body is None:
+            chunks = _encoded_chunks(iter_json(fields_factory()), encoding,
+                                     lambda data: cache.set(version, key, data))
+            response = Response(stream_with_context(chunks), mimetype='application/json')
+        else:
+            response = Response(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
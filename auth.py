@@ -0,0 +1,84 @@
+from functools import wraps
+from flask import session, flash, redirect, url_for
+from flask_login import UserMixin, login_required, current_user
+from models import Admin
+from cache import read_version, bump_version
+from panels import wants_panel
+
+ROLE_FLAGS = ('username', 'name', 'is_super', 'is_founder')
+
+
+# Flask-Login için oturumdaki admin. Rol bilgileri girişte imzalı oturum
+# çerezine sürüm damgasıyla yazılır; yetki/profil değiştiğinde 'admins'
+# sürümü artırılır ve bir sonraki istekte bilgiler DB'den tazelenir.
+class AdminUser(UserMixin):
+    def __init__(self, admin):
+        self.id = admin.id
+        self.username = admin.username
+        self.name = admin.name
+        self.is_super = bool(admin.is_super)
+        self.is_founder = bool(admin.is_founder)
+
+    def get_id(self):
+        return str(self.id)
+
+    @property
+    def role(self):
+        return "Kurucu" if self.is_founder else ("Baş Admin" if self.is_super else "Admin")
+
+    def has_role(self, role):
+        # Baş admin yetkisi isteyen işlemleri kurucu da yapabilir
+        if role == 'founder':
+            return self.is_founder
+        if role == 'super':
+            return self.is_founder or self.is_super
+        return True
+
+
+class _SessionAdmin:
+    def __init__(self, data):
+        self.id = data['id']
+        for field in ROLE_FLAGS:
+            setattr(self, field, data[field])
+
+
+def remember_principal(user):
+    session['_principal'] = {
+        'id': user.id,
+        'v': read_version('admins'),
+        **{field: getattr(user, field) for field in ROLE_FLAGS}
+    }
+
+
+def load_principal(user_id):
+    user_id = int(user_id)
+    data = session.get('_principal')
+    if data and data.get('id') == user_id and data.get('v') == read_version('admins'):
+        return AdminUser(_SessionAdmin(data))
+    admin = Admin.query.get(user_id)
+    if admin is None:
+        session.pop('_principal', None)
+        return None
+    user = AdminUser(admin)
+    remember_principal(user)
+    return user
+
+
+def invalidate_principals():
+    bump_version('admins')
+
+
+def role_required(role, message='Yetkiniz yok.'):
+    def decorator(view):
+        @wraps(view)
+        @login_required
+        def wrapped(*args, **kwargs):
+            if not current_user.has_role(role):
+                # Panel isteği yönlendirmeyi takip edip panoyu panele gömmesin
+                if wants_panel():
+                    return message, 403
+                flash(message, 'danger')
+                return redirect(url_for('main.admin'))
+            return view(*args, **kwargs)
+        return wrapped
+    return decorator
@@ -0,0 +1,102 @@
+import gzip
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+
+# Çalışan uygulamayı durdurmadan veritabanı yedeği. Dosyayı kopyalamak yazma
+# sırasında yarım (bozuk) bir kopya bırakabilir; SQLite'ın çevrimiçi yedek
+# API'si ise sayfaları tutarlı bir anlık görüntüden kopyalar. Kopya
+# BACKUP_PAGES sayfalık adımlarla yapılır ve adımlar arasında kısa bir ara
+# verilir.
+#
+# Başka bir bağlantı adımlar arasında yazarsa SQLite kopyayı baştan alır;
+# sürekli yazılan bir veritabanında yedek hiç bitmeyebilir. WAL kipinde bu
+# yüzden kaynak bağlantıda kopya boyunca bir okuma işlemi açık tutulur: tüm
+# adımlar aynı anlık görüntüyü okur, yazanlar WAL'a yazmaya devam eder ve
+# beklemez. Rollback journal kipinde okuma kilidi yazanları durduracağından
+# kilit sadece adım boyunca tutulur (yazma olursa kopya yeniden başlar).
+#
+# Yedekler <klasör>/kura-YYYYmmdd-HHMMSS.db[.gz] adıyla önce geçici dosyaya
+# yazılır, bütünlük denetiminden sonra yerine taşınır; en yeni 'keep' yedek
+# tutulur, eskiler silinir.
+BACKUP_PREFIX = 'kura-'
+BACKUP_PAGES = 64
+BACKUP_PAUSE = 0.005
+BACKUP_KEEP = 7
+
+
+def backup_database(path, folder, compress=True, keep=BACKUP_KEEP, pages=BACKUP_PAGES, pause=BACKUP_PAUSE):
+    os.makedirs(folder, exist_ok=True)
+    name = '%s%s.db' % (BACKUP_PREFIX, datetime.now().strftime('%Y%m%d-%H%M%S'))
+    tmp_path = os.path.join(folder, '.%s.%d.tmp' % (name, os.getpid()))
+    steps = [0]
+
+    def progress(status, remaining, total):
+        steps[0] += 1
+        if remaining and pause:
+            time.sleep(pause)
+
+    source = sqlite3.connect(path, timeout=30, isolation_level=None)
+    target = sqlite3.connect(tmp_path)
+    try:
+        if source.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+            source.execute('BEGIN')
+            source.execute('SELECT COUNT(*) FROM sqlite_master').fetchone()
+        source.backup(target, pages=pages, progress=progress)
+        if target.execute('PRAGMA quick_check').fetchone()[0] != 'ok':
+            raise RuntimeError('Yedek bütünlük denetiminden geçmedi.')
+        # İlk sayfayla kaynağın WAL işareti de kopyalanır; yedek tek dosya olsun
+        target.execute('PRAGMA journal_mode=DELETE')
+    except BaseException:
+        target.close()
+        _remove(tmp_path)
+        raise
+    finally:
+        source.close()
+    target.close()
+
+    if compress:
+        name += '.gz'
+        gz_path = tmp_path + '.gz'
+        try:
+            with open(tmp_path, 'rb') as src, gzip.open(gz_path, 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        except BaseException:
+            _remove(gz_path)
+            raise
+        finally:
+            _remove(tmp_path)
+        tmp_path = gz_path
+    dest = os.path.join(folder, name)
+    os.replace(tmp_path, dest)
+    return {'path': dest, 'bytes': os.path.getsize(dest), 'steps': steps[0],
+            'removed': rotate_backups(folder, keep)}
+
+
+def list_backups(folder):
+    if not os.path.isdir(folder):
+        return []
+    # Ad zaman damgası içerdiğinden ad sırası tarih sırasıdır
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.startswith(BACKUP_PREFIX) and (name.endswith('.db') or name.endswith('.db.gz'))
+    )
+
+
+# En yeni 'keep' yedek dışındakileri sil (0: silme)
+def rotate_backups(folder, keep=BACKUP_KEEP):
+    if keep <= 0:
+        return []
+    removed = list_backups(folder)[:-keep]
+    for path in removed:
+        _remove(path)
+    return removed
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
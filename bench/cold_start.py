@@ -0,0 +1,107 @@
+# Soğuk açılış ölçümü: her deneme temiz bir Python sürecinde uygulamayı
+# içe aktarır, create_app() ile kurar ve ilk isteğin süresini ısınmalı ve
+# ısınmasız olarak ölçer. Medyan değerler raporlanır.
+#
+#   python bench/cold_start.py --runs 5
+#   python bench/cold_start.py --importtime     # en pahalı 15 modül
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import DEFAULT_VOLUMES
+
+# Alt süreçte çalışır; sonuçları tek satır JSON olarak yazar
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app({'INSTANCE_PATH': sys.argv[1]})
+created = time.perf_counter()
+timings = app_module.warmup(app) if sys.argv[2] == '1' else {}
+warmed = time.perf_counter()
+client = app.test_client()
+client.get('/')
+first = time.perf_counter()
+client.get('/')
+second = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'warmup_ms': (warmed - created) * 1000,
+    'first_request_ms': (first - warmed) * 1000,
+    'second_request_ms': (second - first) * 1000,
+}))
+'''
+COLUMNS = ('import_ms', 'create_app_ms', 'warmup_ms', 'first_request_ms', 'second_request_ms')
+
+
+def prepare(workdir, volumes, seed):
+    from flask import Flask
+    from database import init_database
+    from migrations import run_migrations
+    from models import db
+    from synthetic import populate
+    app = Flask(__name__, instance_path=workdir)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///kura.db'
+    init_database(app)
+    with app.app_context():
+        run_migrations()
+        with db.engine.begin() as conn:
+            populate(conn, volumes, seed)
+        db.engine.dispose()
+
+
+def probe(workdir, warm):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop('DATABASE_URL', None)
+    output = subprocess.run([sys.executable, '-c', PROBE, workdir, '1' if warm else '0'],
+                            cwd=os.path.dirname(workdir), env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def importtime(root, limit=15):
+    # -X importtime çıktısı: 'import time: self | cumulative | modül'
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=root, check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        parts = [p.strip() for p in line.split(':', 1)[-1].split('|')]
+        if len(parts) == 3 and parts[0].isdigit():
+            rows.append((int(parts[1]), int(parts[0]), parts[2]))
+    print('%12s %10s  %s' % ('toplam µs', 'kendi µs', 'modül'))
+    for cumulative, own, name in sorted(rows, reverse=True)[:limit]:
+        print('%12d %10d  %s' % (cumulative, own, name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soğuk açılış ölçümü')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--importtime', action='store_true', help='Modül bazında içe aktarma süreleri')
+    options = parser.parse_args()
+    if options.importtime:
+        importtime(ROOT)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Veritabanı ve sürüm dosyaları geçici instance klasöründe
+        workdir = os.path.join(tmp, 'instance')
+        prepare(workdir, DEFAULT_VOLUMES, options.seed)
+        print('%-10s %s' % ('', ' '.join('%17s' % c for c in COLUMNS)))
+        for warm in (False, True):
+            runs = [probe(workdir, warm) for _ in range(options.runs)]
+            medians = [statistics.median(r[c] for r in runs) for c in COLUMNS]
+            print('%-10s %s' % ('ısınmalı' if warm else 'ısınmasız', ' '.join('%17.1f' % m for m in medians)))
+
+
+if __name__ == '__main__':
+    main()
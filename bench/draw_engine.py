@@ -0,0 +1,99 @@
+# Kura motoru ölçümü: takım sayısı ve kısıt yoğunluğuna göre çözüm süresi,
+# isteğe bağlı olarak da maçların geçici bir veritabanına toplu yazım süresi.
+# Yoğunluk, kulüp başına düşen takım sayısıdır (büyüdükçe "aynı kulüp
+# eşleşmesin" kuralı sıkılaşır). Aynı tohumun aynı kurayı verdiği de denetlenir.
+#
+#   python bench/draw_engine.py --teams 256,1024,4096,16384 --density 1,4,16 --write
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from draw import DrawRules, DrawError, solve_draw
+
+
+def make_pool(count, pots, per_club, players):
+    return [{
+        'name': 'Takım %d' % i,
+        'pot': i % pots + 1,
+        'seed': i + 1 if i < count // 8 else None,
+        'club': 'K%d' % (i // per_club) if per_club > 1 else '',
+        'players': ['T%d O%d' % (i, j) for j in range(players)],
+    } for i in range(count)]
+
+
+def fingerprint(result):
+    if result.format == 'knockout':
+        return [(a['name'], b['name']) for a, b in result.pairs]
+    return [[t['name'] for t in group] for group in result.groups]
+
+
+def measure(teams, fmt, group_size, repeats):
+    times = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = solve_draw(teams, fmt, group_size, seed=12345, rules=DrawRules())
+        times.append(time.perf_counter() - start)
+    again = solve_draw(teams, fmt, group_size, seed=12345, rules=DrawRules())
+    return statistics.median(times), result, fingerprint(again) == fingerprint(result)
+
+
+def write_time(result):
+    # Uygulamanın kendi yazıcısı, boş bir geçici veritabanında
+    from flask import Flask
+    from models import db
+    from database import init_database
+    from fixtures import insert_fixtures
+    path = os.path.join(tempfile.mkdtemp(), 'draw.db')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + path
+    app = Flask(__name__)
+    init_database(app)
+    with app.app_context():
+        db.create_all()
+        start = time.perf_counter()
+        added = insert_fixtures(result.fixtures(date(2026, 1, 1), '20:00'))
+        elapsed = time.perf_counter() - start
+        db.engine.dispose()
+    os.remove(path)
+    return added, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Kura motoru ölçümü')
+    parser.add_argument('--teams', default='256,1024,4096,16384')
+    parser.add_argument('--density', default='1,4,16', help='Kulüp başına takım sayıları')
+    parser.add_argument('--formats', default='knockout,round_robin')
+    parser.add_argument('--group-size', type=int, default=4)
+    parser.add_argument('--players', type=int, default=5, help='Takım başına oyuncu')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--write', action='store_true', help='Veritabanına yazım süresini de ölç')
+    args = parser.parse_args()
+
+    print('%-12s %7s %6s %10s %8s %6s %12s' % ('biçim', 'takım', 'yoğ.', 'çözüm ms', 'maç', 'aynı', 'yazım ms'))
+    for fmt in args.formats.split(','):
+        # Eleme turunda iki torba (1. torba - 2. torba), grupta grup büyüklüğü kadar torba
+        pots = 2 if fmt == 'knockout' else args.group_size
+        for count in [int(n) for n in args.teams.split(',')]:
+            for per_club in [int(d) for d in args.density.split(',')]:
+                teams = make_pool(count, pots, per_club, args.players)
+                try:
+                    elapsed, result, stable = measure(teams, fmt, args.group_size, args.repeats)
+                except DrawError as e:
+                    print('%-12s %7d %6d  çözülemedi: %s' % (fmt, count, per_club, e))
+                    continue
+                written = ''
+                if args.write:
+                    added, seconds = write_time(result)
+                    written = '%.1f' % (seconds * 1000)
+                print('%-12s %7d %6d %10.1f %8d %6s %12s' % (
+                    fmt, count, per_club, elapsed * 1000, result.match_count, 'evet' if stable else 'HAYIR', written))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+# Yük testi: geçici bir SQLite veritabanı sentetik veriyle doldurulur,
+# uygulama süreç içinde çok iş parçacıklı bir sunucuda açılır ve ayrı
+# süreçlerdeki istemciler (giriş yapmış oturumlar dahil) rotaları zorlar.
+# Her senaryo için p50/p95/p99, istek/sn ve istek başına SQL sorgusu
+# raporlanır; bench/baselines.json'daki değerlerden kötüyse çıkış kodu 1.
+# *_cold senaryoları aynı sayfaları önbelleksiz ölçer.
+#
+#   python bench/load_test.py --clients 8 --requests 50
+#   python bench/load_test.py --update-baseline      # yeni taban değerleri yaz
+import argparse
+import http.client
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, 'bench', 'baselines.json')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import DEFAULT_VOLUMES, BENCH_PASSWORD
+
+QUERY_HEADER = 'X-Bench-Queries'
+
+# senaryo: (yöntem, yol, giriş yapacak kullanıcı ya da None)
+SCENARIOS = {
+    'index': ('GET', '/', None),
+    'admin': ('GET', '/admin', 'bench_admin'),
+    'admin_fixtures': ('GET', '/admin/panels/fixtures', 'bench_admin'),
+    'admin_chat': ('GET', '/admin/panels/chat', 'bench_admin'),
+    'logs': ('GET', '/logs', 'bench_founder'),
+    'login': ('POST', '/login', None),
+    'add_photo': ('POST', '/admin/add_photo', 'bench_super'),
+    'admin_chat_send': ('POST', '/admin/chat/send', 'bench_admin'),
+    'index_cold': ('GET', '/', None),
+    'admin_fixtures_cold': ('GET', '/admin/panels/fixtures', 'bench_admin'),
+}
+# Bu senaryolarda istemci her istekten önce (ölçüm dışında) içerik sürümünü
+# artırır; sayfa önbelleği hiç isabet etmez, her istek yeniden render edilir.
+# /admin önbelleksiz bir iskelet olduğundan soğuk çeşidi yok; içeriğini
+# yükleyen fikstür paneli ölçülür.
+COLD_SCENARIOS = {'index_cold', 'admin_fixtures_cold'}
+
+
+# --- Sunucu tarafı (ana süreç) ---
+
+def start_server(workdir, volumes, seed):
+    # Geçici veritabanı, sürüm dosyaları ve yüklemeler çalışma klasöründe
+    os.chdir(workdir)
+    from flask import g, has_request_context
+    from sqlalchemy import event
+    from werkzeug.serving import make_server, WSGIRequestHandler
+    import views
+    from app import create_app
+    from migrations import run_migrations
+    from models import db
+    from synthetic import populate
+
+    app = create_app({'INSTANCE_PATH': workdir, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///bench.db'})
+    # Giriş senaryosu aynı IP'den yüzlerce deneme yapar; sınır ölçümü bozmasın
+    views.login_throttle.limits = dict.fromkeys(views.login_throttle.limits, 10 ** 9)
+    with app.app_context():
+        run_migrations()
+        with db.engine.begin() as conn:
+            populate(conn, volumes, seed)
+
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_query(conn, cursor, statement, parameters, context, executemany):
+            if has_request_context():
+                g.bench_queries = g.get('bench_queries', 0) + 1
+
+    @app.after_request
+    def query_header(response):
+        response.headers[QUERY_HEADER] = str(g.get('bench_queries', 0))
+        return response
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args):
+            pass
+
+    server = make_server('127.0.0.1', 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- İstemci tarafı (ayrı süreçler; uygulamayı içe aktarmaz) ---
+
+def request(port, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        response.read()
+        return response
+    finally:
+        conn.close()
+
+
+def login(port, username):
+    body = 'username=%s&password=%s' % (username, BENCH_PASSWORD)
+    response = request(port, 'POST', '/login', body, {'Content-Type': 'application/x-www-form-urlencoded'})
+    cookie = response.getheader('Set-Cookie')
+    if response.status != 302 or not cookie:
+        raise RuntimeError('%s giriş yapamadı (%s)' % (username, response.status))
+    return cookie.split(';', 1)[0]
+
+
+def png_bytes(rng):
+    from PIL import Image
+    image = Image.new('RGB', (64, 64), tuple(rng.randrange(256) for _ in range(3)))
+    image.putpixel((rng.randrange(64), rng.randrange(64)), (rng.randrange(256), 0, 0))
+    out = io.BytesIO()
+    image.save(out, 'PNG')
+    return out.getvalue()
+
+
+def multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(('--%s\r\nContent-Disposition: form-data; name="%s"\r\n\r\n%s\r\n' % (boundary, name, value)).encode())
+    for name, (filename, data) in files.items():
+        parts.append(('--%s\r\nContent-Disposition: form-data; name="%s"; filename="%s"\r\n'
+                      'Content-Type: application/octet-stream\r\n\r\n' % (boundary, name, filename)).encode() + data + b'\r\n')
+    parts.append(('--%s--\r\n' % boundary).encode())
+    return b''.join(parts), 'multipart/form-data; boundary=' + boundary
+
+
+def client(args):
+    port, scenario, count, client_seed, workdir = args
+    method, path, username = SCENARIOS[scenario]
+    rng = random.Random(client_seed)
+    headers = {}
+    if username:
+        headers['Cookie'] = login(port, username)
+    if scenario in COLD_SCENARIOS:
+        # Sürüm dosyaları sunucunun instance klasöründe; uygulama gerekmez
+        import cache
+        cache.init_cache(argparse.Namespace(instance_path=workdir))
+    latencies, queries, errors = [], [], 0
+    for i in range(count):
+        if scenario in COLD_SCENARIOS:
+            cache.bump_content_version()
+        body, request_headers = None, dict(headers)
+        if scenario == 'login':
+            body = 'username=bench_admin&password=%s' % BENCH_PASSWORD
+            request_headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        elif scenario == 'admin_chat_send':
+            body = 'chat_message=yük testi %d-%d' % (client_seed, i)
+            request_headers['Content-Type'] = 'application/x-www-form-urlencoded; charset=utf-8'
+            body = body.encode('utf-8')
+        elif scenario == 'add_photo':
+            body, content_type = multipart({}, {'photo_file': ('bench%d.png' % i, png_bytes(rng))})
+            request_headers['Content-Type'] = content_type
+        start = time.perf_counter()
+        response = request(port, method, path, body, request_headers)
+        latencies.append(time.perf_counter() - start)
+        if response.status >= 400:
+            errors += 1
+        queries.append(int(response.getheader(QUERY_HEADER) or 0))
+    return latencies, queries, errors
+
+
+# --- Rapor ---
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def warmup(args):
+    port, scenario = args
+    method, path, username = SCENARIOS[scenario]
+    if method == 'GET':
+        request(port, method, path, headers={'Cookie': login(port, username)} if username else {})
+
+
+def run_scenario(pool, port, workdir, scenario, options):
+    # Süreç açılışı ve ilk render (şablon derleme, önbellek) ölçüme girmesin
+    pool.map(warmup, [(port, scenario)] * options.clients)
+    jobs = [(port, scenario, options.requests, options.seed * 1000 + i, workdir) for i in range(options.clients)]
+    start = time.perf_counter()
+    results = pool.map(client, jobs)
+    elapsed = time.perf_counter() - start
+    latencies = [x for r in results for x in r[0]]
+    queries = [x for r in results for x in r[1]]
+    return {
+        'requests': len(latencies),
+        'errors': sum(r[2] for r in results),
+        'rps': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'queries': sum(queries) / len(queries) if queries else 0.0,
+    }
+
+
+def compare(results, baseline, tolerance):
+    failures = []
+    for scenario, result in results.items():
+        expected = baseline.get('scenarios', {}).get(scenario)
+        if not expected:
+            continue
+        if result['errors']:
+            failures.append('%s: %d hatalı yanıt' % (scenario, result['errors']))
+        # Sorgu sayısı makineden bağımsızdır, sıkı denetlenir
+        if result['queries'] > expected['queries'] + 0.5:
+            failures.append('%s: istek başına %.1f sorgu (taban %.1f)' % (scenario, result['queries'], expected['queries']))
+        if result['p95_ms'] > expected['p95_ms'] * (1 + tolerance):
+            failures.append('%s: p95 %.1f ms (taban %.1f ms, tolerans %%%d)' % (
+                scenario, result['p95_ms'], expected['p95_ms'], tolerance * 100))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Yük testi')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=50, help='İstemci başına istek')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--tolerance', type=float, default=0.5, help='p95 için izin verilen kötüleşme oranı')
+    parser.add_argument('--update-baseline', action='store_true')
+    for name, value in DEFAULT_VOLUMES.items():
+        parser.add_argument('--' + name.replace('_', '-'), type=int, default=value)
+    options = parser.parse_args()
+    volumes = {name: getattr(options, name) for name in DEFAULT_VOLUMES}
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(workdir, volumes, options.seed)
+        port = server.server_port
+        print('clients=%d requests=%d %s' % (
+            options.clients, options.requests, ' '.join('%s=%d' % kv for kv in volumes.items())))
+        print('%-20s %8s %6s %9s %8s %8s %8s %8s' % (
+            'senaryo', 'istek', 'hata', 'istek/sn', 'p50 ms', 'p95 ms', 'p99 ms', 'sorgu'))
+        results = {}
+        # İstemciler temiz süreçlerde: uygulama durumunu (iş parçacıkları, bağlantılar) devralmasınlar
+        with multiprocessing.get_context('spawn').Pool(options.clients) as pool:
+            for scenario in options.scenarios.split(','):
+                r = results[scenario] = run_scenario(pool, port, workdir, scenario, options)
+                print('%-20s %8d %6d %9.1f %8.2f %8.2f %8.2f %8.1f' % (
+                    scenario, r['requests'], r['errors'], r['rps'], r['p50_ms'], r['p95_ms'], r['p99_ms'], r['queries']))
+        server.shutdown()
+        # Kuyruktaki işler (fotoğraf türevleri) geçici klasör silinmeden dursun
+        from jobs import job_queue
+        job_queue.stop()
+        os.chdir(ROOT)
+
+    if options.update_baseline:
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump({'volumes': volumes, 'clients': options.clients, 'scenarios': {
+                name: {'p95_ms': round(r['p95_ms'], 2), 'queries': round(r['queries'], 2)} for name, r in results.items()
+            }}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('Taban değerler yazıldı: %s' % BASELINE_PATH)
+        return
+    if not os.path.exists(BASELINE_PATH):
+        print('Taban dosyası yok; --update-baseline ile oluşturun.')
+        return
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    if baseline.get('volumes') != volumes or baseline.get('clients') != options.clients:
+        print('Uyarı: taban değerler farklı hacim/istemci sayısıyla ölçülmüş, karşılaştırma atlandı.')
+        return
+    failures = compare(results, baseline, options.tolerance)
+    for failure in failures:
+        print('GERİLEME: ' + failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+# SQLite motor profili karşılaştırması: varsayılan ayarlar (rollback journal)
+# ile database.py'deki WAL/pragma profili, birden fazla süreç aynı anda okuyup
+# yazarken ölçülür. Her mod için yeni bir geçici veritabanı kurulur ve aynı
+# tohumla aynı iş yükü uygulanır.
+#
+#   python bench/sqlite_profile.py --workers 4 --seconds 10 --write-ratio 0.2
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, select, insert
+from sqlalchemy.exc import OperationalError
+from models import db, MatchResult, Player, LoginAttempt
+from database import sqlite_pragmas, apply_pragmas
+
+MATCHES = MatchResult.__table__
+PLAYERS = Player.__table__
+ATTEMPTS = LoginAttempt.__table__
+
+
+def make_engine(path, mode, busy_timeout):
+    if mode == 'baseline':
+        # Uygulamanın eski davranışı: pysqlite varsayılanları
+        return create_engine('sqlite:///' + path, connect_args={'timeout': busy_timeout / 1000})
+    pragmas = sqlite_pragmas()
+    pragmas['busy_timeout'] = busy_timeout
+    engine = create_engine('sqlite:///' + path, connect_args={'timeout': busy_timeout / 1000})
+    event.listen(engine, 'connect', lambda conn, record: apply_pragmas(conn, pragmas))
+    return engine
+
+
+def seed(path, mode, busy_timeout, matches):
+    engine = make_engine(path, mode, busy_timeout)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(MATCHES), [
+            {'id': i, 'team1': 'A%d' % i, 'team2': 'B%d' % i, 'date': '2025-01-01', 'time': '20:00'}
+            for i in range(1, matches + 1)
+        ])
+        conn.execute(insert(PLAYERS), [
+            {'name': 'p%d_%d' % (i, j), 'team_id': i, 'team_name': ('A%d' if j < 5 else 'B%d') % i}
+            for i in range(1, matches + 1) for j in range(10)
+        ])
+    engine.dispose()
+
+
+def worker(args):
+    path, mode, busy_timeout, seconds, write_ratio, worker_seed = args
+    rng = random.Random(worker_seed)
+    engine = make_engine(path, mode, busy_timeout)
+    stats = {'reads': 0, 'writes': 0, 'locked': 0, 'latencies': []}
+    fixtures = select(MATCHES, PLAYERS.c.name).join(PLAYERS, PLAYERS.c.team_id == MATCHES.c.id)
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        is_write = rng.random() < write_ratio
+        start = time.perf_counter()
+        try:
+            if is_write:
+                with engine.begin() as conn:
+                    conn.execute(insert(ATTEMPTS), {'username': 'u%d' % rng.randrange(1000), 'success': False,
+                                                    'timestamp': datetime.now()})
+                stats['writes'] += 1
+            else:
+                with engine.connect() as conn:
+                    conn.execute(fixtures).fetchall()
+                stats['reads'] += 1
+            stats['latencies'].append(time.perf_counter() - start)
+        except OperationalError as e:
+            if 'locked' not in str(e) and 'busy' not in str(e):
+                raise
+            stats['locked'] += 1
+    engine.dispose()
+    return stats
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def run(mode, options):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        seed(path, mode, options.busy_timeout, options.matches)
+        jobs = [(path, mode, options.busy_timeout, options.seconds, options.write_ratio, options.seed + i)
+                for i in range(options.workers)]
+        with multiprocessing.Pool(options.workers) as pool:
+            results = pool.map(worker, jobs)
+    reads = sum(r['reads'] for r in results)
+    writes = sum(r['writes'] for r in results)
+    locked = sum(r['locked'] for r in results)
+    latencies = [x for r in results for x in r['latencies']]
+    total = reads + writes + locked
+    return {
+        'mode': mode,
+        'reads_per_s': reads / options.seconds,
+        'writes_per_s': writes / options.seconds,
+        'locked_pct': 100.0 * locked / total if total else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--matches', type=int, default=300)
+    parser.add_argument('--busy-timeout', type=int, default=100, help='ms; düşük değer kilit çakışmalarını görünür kılar')
+    parser.add_argument('--seed', type=int, default=1)
+    options = parser.parse_args()
+
+    print('workers=%d seconds=%s write_ratio=%s matches=%d busy_timeout=%dms' % (
+        options.workers, options.seconds, options.write_ratio, options.matches, options.busy_timeout))
+    print('%-9s %10s %10s %9s %8s %8s' % ('mode', 'reads/s', 'writes/s', 'locked%', 'p50 ms', 'p95 ms'))
+    for mode in ('baseline', 'profile'):
+        r = run(mode, options)
+        print('%-9s %10.1f %10.1f %9.2f %8.2f %8.2f' % (
+            r['mode'], r['reads_per_s'], r['writes_per_s'], r['locked_pct'], r['p50_ms'], r['p95_ms']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# Ölçümler için sentetik veri üreticisi. Aynı tohum ve hacimlerle her
+# seferinde aynı satırları üretir; doğrudan toplu INSERT ile yazar.
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from fixtures import parse_kickoff
+from models import MatchResult, Player, Photo, AdminChat, LoginAttempt, Announcement, Admin
+
+DEFAULT_VOLUMES = {
+    'matches': 300,
+    'players': 5,          # takım başına
+    'photos': 500,
+    'chat': 2000,
+    'login_attempts': 20000,
+    'announcements': 200,
+}
+
+# Ölçüm oturumları için kullanıcılar (parola herkes için aynı)
+BENCH_PASSWORD = 'bench'
+BENCH_ADMINS = [
+    {'username': 'bench_founder', 'name': 'Ölçüm Kurucu', 'is_founder': True, 'is_super': True},
+    {'username': 'bench_super', 'name': 'Ölçüm Baş Admin', 'is_founder': False, 'is_super': True},
+    {'username': 'bench_admin', 'name': 'Ölçüm Admin', 'is_founder': False, 'is_super': False},
+]
+BATCH = 5000
+
+
+def _batched(conn, table, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH:
+            conn.execute(insert(table), batch)
+            batch = []
+    if batch:
+        conn.execute(insert(table), batch)
+
+
+def populate(conn, volumes=None, seed=1):
+    volumes = dict(DEFAULT_VOLUMES, **(volumes or {}))
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, 12, 0)
+
+    conn.execute(insert(Admin.__table__), [dict(a, password=BENCH_PASSWORD) for a in BENCH_ADMINS])
+    admin_ids = [row[0] for row in conn.exec_driver_sql(
+        "SELECT id FROM admin WHERE username LIKE 'bench_%' ORDER BY id")]
+
+    matches = [{
+        'id': i,
+        'team1': 'Takım %d' % (2 * i - 1),
+        'team2': 'Takım %d' % (2 * i),
+        'date': (start + timedelta(days=i // 8)).date().isoformat(),
+        'time': '%02d:%02d' % (rng.randrange(10, 22), rng.choice((0, 15, 30, 45))),
+    } for i in range(1, volumes['matches'] + 1)]
+    for m in matches:
+        m['kickoff'] = parse_kickoff(m['date'], m['time'])
+    _batched(conn, MatchResult.__table__, iter(matches))
+    _batched(conn, Player.__table__, (
+        {'name': 'Oyuncu %d-%d' % (m['id'], j), 'team_id': m['id'], 'team_name': team}
+        for m in matches for team in (m['team1'], m['team2']) for j in range(volumes['players'])
+    ))
+    _batched(conn, Photo.__table__, (
+        {'url': '/static/uploads/%064x.jpg' % rng.getrandbits(256), 'width': 1920, 'height': 1080}
+        for _ in range(volumes['photos'])
+    ))
+    _batched(conn, Announcement.__table__, (
+        {'text': 'Duyuru %d: %s' % (i, ' '.join(rng.choice(('maç', 'kura', 'saat', 'saha', 'değişti')) for _ in range(8)))}
+        for i in range(volumes['announcements'])
+    ))
+    _batched(conn, AdminChat.__table__, (
+        {'admin_id': admin_ids[i % len(admin_ids)], 'username': BENCH_ADMINS[i % len(admin_ids)]['username'],
+         'role': 'Admin', 'message': 'Mesaj %d' % i, 'timestamp': start + timedelta(minutes=i)}
+        for i in range(volumes['chat'])
+    ))
+    _batched(conn, LoginAttempt.__table__, (
+        {'username': rng.choice(('bench_admin', 'bench_super', 'bilinmeyen')), 'success': rng.random() < 0.7,
+         'timestamp': start + timedelta(seconds=30 * i)}
+        for i in range(volumes['login_attempts'])
+    ))
+    return volumes
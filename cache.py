@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+
+# Sürümler instance klasöründeki küçük dosyalarda tutulur; böylece tüm
+# gunicorn worker'ları aynı sürümü görür ve kontrol için DB'ye gidilmez
+_instance_path = None
+
+
+def init_cache(app):
+    global _instance_path
+    os.makedirs(app.instance_path, exist_ok=True)
+    _instance_path = app.instance_path
+
+
+def _version_path(name):
+    return os.path.join(_instance_path, '%s.version' % name)
+
+
+def read_version(name):
+    try:
+        with open(_version_path(name)) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        version = ''
+    if not version:
+        version = bump_version(name)
+    return version
+
+
+def bump_version(name):
+    # Sürüm nanosaniye cinsinden zaman damgası; atomik yazım için önce geçici dosya
+    version = str(time.time_ns())
+    path = _version_path(name)
+    tmp_path = '%s.%d.%d.tmp' % (path, os.getpid(), threading.get_ident())
+    with open(tmp_path, 'w') as f:
+        f.write(version)
+    os.replace(tmp_path, path)
+    return version
+
+
+def content_version():
+    return read_version('content')
+
+
+# İçeriğin ayrı sürümlenen parçaları: bir fotoğraf yüklemesi fikstür
+# tablosunun önbelleğini boşa çıkarmaz. 'content' sürümü her değişiklikte
+# artar (tam sayfa önbelleği, ETag); parça verilmezse hepsi geçersiz olur.
+CONTENT_PARTS = ('fixtures', 'announcements', 'photos', 'about')
+
+
+def bump_content_version(*parts):
+    for part in parts or CONTENT_PARTS:
+        bump_version(part)
+    return bump_version('content')
+
+
+def version_timestamp(version):
+    return datetime.fromtimestamp(int(version) / 1e9, tz=timezone.utc).replace(microsecond=0)
+
+
+# Render edilmiş sayfaların worker içi önbelleği; sürüm değişince tamamen boşalır
+class PageCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
+
+    def get(self, version, key):
+        with self._lock:
+            if version != self._version:
+                return None
+            return self._entries.get(key)
+
+    def set(self, version, key, value):
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._entries = {}
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = value
+
+
+# Şablon parçalarının worker içi önbelleği. Anahtar (parça adı, veri sürümü,
+# parametreler) olduğundan eski sürümler ayrıca silinmez, LRU ile düşer.
+# Hem kayıt sayısı hem toplam boyut (karakter) sınırlıdır.
+class FragmentCache:
+    def __init__(self, max_entries=256, max_size=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses[key[0]] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits[key[0]] += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            if len(value) > self.max_size:
+                return
+            self._entries[key] = value
+            self._size += len(value)
+            while len(self._entries) > self.max_entries or self._size > self.max_size:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'size': self._size,
+                    'hits': dict(self.hits), 'misses': dict(self.misses)}
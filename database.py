@@ -0,0 +1,54 @@
+import os
+from sqlalchemy import event
+from models import db
+
+DEFAULT_DATABASE_URI = 'sqlite:///kura.db'
+
+# Çok worker'lı gunicorn altında SQLite ayarları. WAL modunda okuyucular
+# yazanları beklemez; busy_timeout kilit çakışmalarında hemen hata vermek
+# yerine bekletir. Her değer ortam değişkeniyle ezilebilir (SQLITE_<AD>).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,           # ms
+    'mmap_size': 256 * 1024 * 1024,  # bayt
+    'cache_size': -20000,           # negatif değer KiB demek (~20 MB)
+    'temp_store': 'MEMORY',
+    # Yabancı anahtarlar (oyuncu -> maç ON DELETE CASCADE) SQLite'ta varsayılan kapalı
+    'foreign_keys': 'ON',
+}
+
+
+def sqlite_pragmas():
+    return {name: os.environ.get('SQLITE_' + name.upper(), value) for name, value in SQLITE_PRAGMAS.items()}
+
+
+def engine_options():
+    # Havuz worker başına: her iş parçacığına bir bağlantı ve birkaç yedek
+    threads = int(os.environ.get('GUNICORN_THREADS', 1))
+    pragmas = sqlite_pragmas()
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', threads + 2)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 5)),
+        'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        'connect_args': {'timeout': int(pragmas['busy_timeout']) / 1000},
+    }
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute('PRAGMA %s = %s' % (name, value))
+    cursor.close()
+
+
+def init_database(app):
+    app.config.setdefault('SQLALCHEMY_DATABASE_URI', os.environ.get('DATABASE_URL', DEFAULT_DATABASE_URI))
+    is_sqlite = app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite')
+    if is_sqlite:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options()
+    db.init_app(app)
+    if is_sqlite:
+        pragmas = sqlite_pragmas()
+        with app.app_context():
+            event.listen(db.engine, 'connect', lambda conn, record: apply_pragmas(conn, pragmas))
@@ -0,0 +1,324 @@
+import csv
+import heapq
+import math
+import random
+import secrets
+from collections import deque
+from datetime import timedelta
+from fixtures import read_records, PLAYER_SEPARATOR, NAME_MAX
+
+# Tohumlu kura motoru. Takım havuzu (torba, seri başı, kulüp bilgisiyle)
+# eleme turu eşleşmelerine ya da lig usulü gruplara ayrılır. Aynı havuz ve
+# aynı tohum her zaman aynı kurayı verir: tüm rastgelelik tek bir
+# random.Random(seed) örneğinden gelir, küme (set) sırasına hiç güvenilmez.
+FORMATS = ('knockout', 'round_robin')
+
+# Takım dosyası başlıkları; Türkçe başlıklar da kabul edilir
+TEAM_ALIASES = {
+    'name': 'name', 'team': 'name', 'takim': 'name',
+    'pot': 'pot', 'torba': 'pot',
+    'seed': 'seed', 'seri_basi': 'seed',
+    'club': 'club', 'kulup': 'club',
+    'players': 'players', 'oyuncular': 'players',
+}
+
+
+class DrawError(ValueError):
+    pass
+
+
+class DrawRules:
+    def __init__(self, no_same_pot=True, no_same_club=True):
+        self.no_same_pot = no_same_pot
+        self.no_same_club = no_same_club
+
+    def compatible(self, a, b):
+        if a['seeded'] and b['seeded']:
+            return False
+        if self.no_same_pot and a['pot'] is not None and a['pot'] == b['pot']:
+            return False
+        if self.no_same_club and a['club'] and a['club'] == b['club']:
+            return False
+        return True
+
+    # Sınıfın tüm üyeleri bu takımla çakışıyorsa içinde aramaya gerek yok
+    def blocked(self, team, key):
+        return (key == ('seeded',) and team['seeded']) or key == self.class_key(team) != ('free',)
+
+    def class_key(self, team):
+        # Eşleştirmede önce en kalabalık sınıf ele alınır (en kısıtlı takımlar)
+        if team['seeded']:
+            return ('seeded',)
+        if self.no_same_pot and team['pot'] is not None:
+            return ('pot', team['pot'])
+        if self.no_same_club and team['club']:
+            return ('club', team['club'])
+        return ('free',)
+
+
+class Draw:
+    def __init__(self, seed, fmt, pairs=None, groups=None, byes=None):
+        self.seed = seed
+        self.format = fmt
+        self.pairs = pairs or []
+        self.groups = groups or []
+        self.byes = byes or []
+
+    @property
+    def match_count(self):
+        if self.format == 'knockout':
+            return len(self.pairs)
+        return sum(len(g) * (len(g) - 1) // 2 for g in self.groups)
+
+    # insert_fixtures'a verilecek satırları tembel olarak üretir
+    def fixtures(self, start_date, time='', interval_days=7):
+        if self.format == 'knockout':
+            for team1, team2 in self.pairs:
+                yield _fixture(team1, team2, start_date, time)
+            return
+        schedules = [list(round_robin_rounds(group)) for group in self.groups]
+        rounds = max((len(s) for s in schedules), default=0)
+        # Tüm gruplar tur tur ilerler; her tur interval_days gün sonra
+        for r in range(rounds):
+            day = start_date + timedelta(days=r * interval_days)
+            for schedule in schedules:
+                if r < len(schedule):
+                    for team1, team2 in schedule[r]:
+                        yield _fixture(team1, team2, day, time)
+
+
+def _fixture(team1, team2, day, time):
+    return {
+        'team1': team1['name'], 'team2': team2['name'],
+        'date': day.isoformat(), 'time': time,
+        't1_players': team1['players'], 't2_players': team2['players'],
+    }
+
+
+def new_seed():
+    return secrets.randbelow(2 ** 31)
+
+
+def solve_draw(teams, fmt='knockout', group_size=4, seed=None, rules=None, attempts=20):
+    if fmt not in FORMATS:
+        raise DrawError(f'Bilinmeyen kura biçimi: {fmt}')
+    if len(teams) < 2:
+        raise DrawError('Kura için en az iki takım gerekli.')
+    seed = new_seed() if seed is None else seed
+    rules = rules or DrawRules()
+    rng = random.Random(seed)
+    if fmt == 'knockout':
+        slots = len(teams) // 2
+    else:
+        if group_size < 2:
+            raise DrawError('Grup büyüklüğü en az 2 olmalı.')
+        slots = math.ceil(len(teams) / group_size)
+    teams = _mark_seeded(teams, slots)
+    error = None
+    # Rastgele sıra çıkmaza girerse aynı rng ile yeniden denenir; deneme
+    # sayısı sabit olduğu için sonuç yine tohumdan belirlenir
+    for _ in range(attempts):
+        try:
+            if fmt == 'knockout':
+                pool, byes = _pick_bye(teams, rng)
+                pairs = _pair_teams(pool, rules, rng)
+                return Draw(seed, fmt, pairs=_bracket_order(pairs), byes=byes)
+            return Draw(seed, fmt, groups=_fill_groups(teams, slots, group_size, rules, rng))
+        except DrawError as e:
+            error = e
+    raise error
+
+
+def _mark_seeded(teams, slots):
+    # Seri başları en iyi 'slots' takımdır: her eşleşmeye/gruba en fazla bir tane
+    ranked = sorted((t for t in teams if t.get('seed') is not None), key=lambda t: t['seed'])
+    seeded = {id(t) for t in ranked[:slots]}
+    return [dict(t, seeded=id(t) in seeded) for t in teams]
+
+
+def _pick_bye(teams, rng):
+    if len(teams) % 2 == 0:
+        return teams, []
+    seeded = [t for t in teams if t['seeded']]
+    if seeded:
+        bye = min(seeded, key=lambda t: t['seed'])
+    else:
+        bye = teams[rng.randrange(len(teams))]
+    return [t for t in teams if t is not bye], [bye]
+
+
+def _pair_teams(teams, rules, rng):
+    pool = list(teams)
+    rng.shuffle(pool)
+    classes = {}
+    for team in pool:
+        classes.setdefault(rules.class_key(team), []).append(team)
+    order = {key: i for i, key in enumerate(classes)}
+    heap = [(-len(members), order[key], key) for key, members in classes.items()]
+    heapq.heapify(heap)
+
+    def valid(entry):
+        return len(classes[entry[2]]) == -entry[0] and entry[0] < 0
+
+    def push(key):
+        if classes[key]:
+            heapq.heappush(heap, (-len(classes[key]), order[key], key))
+
+    pairs = []
+    while heap:
+        entry = heapq.heappop(heap)
+        if not valid(entry):
+            continue
+        key = entry[2]
+        team = classes[key].pop()
+        push(key)
+        partner = None
+        skipped = []
+        while heap and partner is None:
+            candidate = heapq.heappop(heap)
+            if not valid(candidate):
+                continue
+            skipped.append(candidate)
+            if rules.blocked(team, candidate[2]):
+                continue
+            members = classes[candidate[2]]
+            for i in range(len(members) - 1, -1, -1):
+                if rules.compatible(team, members[i]):
+                    partner = members[i]
+                    members[i] = members[-1]
+                    members.pop()
+                    break
+        for candidate in skipped:
+            push(candidate[2])
+        if partner is None:
+            raise DrawError(f'{team["name"]} için kurallara uyan rakip bulunamadı.')
+        # Seri başı ya da üst torbadaki takım ev sahibi yazılır
+        pairs.append((team, partner) if _rank(team) <= _rank(partner) else (partner, team))
+    return pairs
+
+
+def _rank(team):
+    return (not team['seeded'], team['seed'] or 0, team['pot'] if team['pot'] is not None else math.inf)
+
+
+def _bracket_order(pairs):
+    # Seri başları ağaca klasik düzende dağıtılır: 1 ve 2 ancak finalde,
+    # ilk dört ancak yarı finalde karşılaşabilir
+    size = 1
+    while size < len(pairs):
+        size *= 2
+    positions = [0]
+    while len(positions) < size:
+        positions = [p for x in positions for p in (x, 2 * len(positions) - 1 - x)]
+    positions = [p for p in positions if p < len(pairs)]
+    slots = [None] * len(pairs)
+    seeded = sorted((p for p in pairs if p[0]['seeded']), key=lambda p: p[0]['seed'])
+    for position, pair in zip(positions, seeded):
+        slots[position] = pair
+    rest = iter(p for p in pairs if not p[0]['seeded'])
+    return [slot if slot is not None else next(rest) for slot in slots]
+
+
+def _fill_groups(teams, group_count, group_size, rules, rng):
+    groups = [[] for _ in range(group_count)]
+    pots = [set() for _ in range(group_count)]
+    clubs = [set() for _ in range(group_count)]
+
+    def place(team, index):
+        groups[index].append(team)
+        if team['pot'] is not None:
+            pots[index].add(team['pot'])
+        if team['club']:
+            clubs[index].add(team['club'])
+
+    # Seri başları sırayla birer gruba
+    seeded = sorted((t for t in teams if t['seeded']), key=lambda t: t['seed'])
+    for index, team in enumerate(seeded):
+        place(team, index)
+    # Gruplar doluluklarına göre kovalarda; her takım en boş uygun gruba gider
+    by_size = [deque() for _ in range(group_size + 1)]
+    for index in range(group_count):
+        by_size[len(groups[index])].append(index)
+    rest = [t for t in teams if not t['seeded']]
+    rng.shuffle(rest)
+    rest.sort(key=lambda t: t['pot'] if t['pot'] is not None else math.inf)
+    for team in rest:
+        placed = False
+        for size in range(group_size):
+            bucket = by_size[size]
+            for _ in range(len(bucket)):
+                index = bucket.popleft()
+                if ((rules.no_same_pot and team['pot'] is not None and team['pot'] in pots[index])
+                        or (rules.no_same_club and team['club'] and team['club'] in clubs[index])):
+                    bucket.append(index)
+                    continue
+                place(team, index)
+                by_size[size + 1].append(index)
+                placed = True
+                break
+            if placed:
+                break
+        if not placed:
+            raise DrawError(f'{team["name"]} için kurallara uyan grup bulunamadı.')
+    return groups
+
+
+# Çember yöntemi: n takım için n-1 (tek sayıda ise n) tur
+def round_robin_rounds(teams):
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)
+    n = len(teams)
+    for r in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if home is None or away is None:
+                continue
+            # Sabit takım her tur ev sahibi olmasın
+            pairs.append((away, home) if i == 0 and r % 2 else (home, away))
+        yield pairs
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+
+
+def parse_team_file(filename, stream):
+    try:
+        records = read_records(filename, stream, list_key='teams')
+    except (ValueError, csv.Error) as e:
+        return [], [(0, f'dosya okunamadı: {e}')]
+    teams, errors, names = [], [], set()
+    for row_no, item in records:
+        team = {'name': '', 'pot': None, 'seed': None, 'club': '', 'players': []}
+        problems = []
+        for key, value in (item.items() if isinstance(item, dict) else []):
+            field = TEAM_ALIASES.get((key or '').strip().lower())
+            if field is None or value is None:
+                continue
+            if field == 'players':
+                if isinstance(value, str):
+                    value = value.split(PLAYER_SEPARATOR)
+                team['players'] = [str(p).strip() for p in value if str(p).strip()]
+            elif field in ('pot', 'seed'):
+                value = str(value).strip()
+                if not value:
+                    continue
+                try:
+                    team[field] = int(value)
+                except ValueError:
+                    problems.append(f'{field} sayı olmalı')
+            else:
+                team[field] = str(value).strip()
+        if not team['name']:
+            problems.append('takım adı zorunlu')
+        elif team['name'] in names:
+            problems.append('takım adı tekrar ediyor')
+        if any(len(name) > NAME_MAX for name in [team['name']] + team['players']):
+            problems.append(f'isimler en fazla {NAME_MAX} karakter olabilir')
+        if problems:
+            errors.append((row_no, ', '.join(problems)))
+            continue
+        names.add(team['name'])
+        teams.append(team)
+    if not teams and not errors:
+        errors.append((0, 'dosyada takım bulunamadı'))
+    return teams, errors
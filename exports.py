@@ -0,0 +1,104 @@
+import csv
+import json
+from sqlalchemy import select
+from fixtures import iter_fixtures, PLAYER_SEPARATOR
+from models import db, AdminChat, LoginAttempt
+
+# Kurucu için CSV/JSONL dışa aktarma. Satırlar id sırasıyla EXPORT_BATCH'lik
+# partiler halinde okunur ve satır satır akıtılır; tablo ne kadar büyük olursa
+# olsun bellekte bir partiden fazlası tutulmaz. Partiler arasında oturum
+# kapatılır, uzun süren indirme okuma işlemini (ve WAL'ı) açık tutmaz.
+EXPORT_BATCH = 1000
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson; charset=utf-8',
+}
+
+LOGIN_COLUMNS = ('id', 'username', 'success', 'timestamp')
+CHAT_COLUMNS = ('id', 'admin_id', 'username', 'role', 'message', 'timestamp')
+# Başlıklar içe aktarmanın beklediği adlar; dışa aktarılan CSV geri yüklenebilir
+FIXTURE_COLUMNS = ('match_id', 'date', 'time', 'kickoff', 'team1', 'team2', 'team1_players', 'team2_players')
+
+
+def iter_table(model, columns, batch_size=EXPORT_BATCH):
+    table_columns = [getattr(model, name) for name in columns]
+    last_id = 0
+    while True:
+        rows = db.session.execute(
+            select(*table_columns).where(model.id > last_id).order_by(model.id).limit(batch_size)
+        ).all()
+        db.session.close()
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(columns, row))
+        last_id = rows[-1][0]
+
+
+def iter_login_attempts():
+    return iter_table(LoginAttempt, LOGIN_COLUMNS)
+
+
+def iter_chat():
+    return iter_table(AdminChat, CHAT_COLUMNS)
+
+
+def iter_fixture_rows():
+    for group in iter_fixtures():
+        yield {
+            'match_id': group['match_id'],
+            'date': group['date'],
+            'time': group['time'],
+            'kickoff': group['kickoff'],
+            'team1': group['team1'],
+            'team2': group['team2'],
+            'team1_players': group['t1_players'],
+            'team2_players': group['t2_players'],
+        }
+
+
+# ad -> (satır üreteci, sütunlar)
+EXPORTS = {
+    'login_attempts': (iter_login_attempts, LOGIN_COLUMNS),
+    'chat': (iter_chat, CHAT_COLUMNS),
+    'fixtures': (iter_fixture_rows, FIXTURE_COLUMNS),
+}
+
+
+# csv.writer'ın yazdığı satırı biriktirmeden geri döner
+class _Line:
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return PLAYER_SEPARATOR.join(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat(sep=' ')
+    return value
+
+
+def _json_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+
+def csv_lines(rows, columns):
+    writer = csv.writer(_Line())
+    # BOM: Excel Türkçe karakterleri doğru açsın (içe aktarma utf-8-sig okur)
+    yield '\ufeff' + writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([_cell(row[name]) for name in columns])
+
+
+def jsonl_lines(rows, columns):
+    for row in rows:
+        yield json.dumps({name: row[name] for name in columns}, ensure_ascii=False, default=_json_value) + '\n'
+
+
+def export_lines(name, fmt):
+    iter_rows, columns = EXPORTS[name]
+    lines = csv_lines if fmt == 'csv' else jsonl_lines
+    return lines(iter_rows(), columns)
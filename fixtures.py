@@ -0,0 +1,273 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from datetime import date as date_cls, datetime, time as time_cls
+from itertools import islice
+from sqlalchemy import insert
+from models import db, MatchResult, Player
+from pagination import keyset_paginate
+
+
+# Fikstürün bir sayfası: maçlar id sırasıyla imleçli sayfalanır, sadece
+# sayfadaki maçların oyuncuları yüklenir (sayfa başına sabit sayıda sorgu).
+# match_ids verilirse (arama) sadece o maçlar listelenir.
+#
+# Grup numaraları sayılmaz (COUNT tabloyla büyür), sayfanın konumundan
+# çıkarılır: sayfa bağlantıları imlecin yanında sınırdaki maçın numarasını
+# (number) taşır. Sonraki sayfa için bu, sayfanın ilk maçının; önceki sayfa
+# için son maçının numarasıdır. İlk sayfa her zaman 1'den başlar. Aramada
+# numara sonuçlar içindeki sıradır.
+FIXTURES_PER_PAGE = 20
+
+
+def fixture_page(per_page=FIXTURES_PER_PAGE, before=None, after=None, match_ids=None, player_count=1, number=None):
+    query = MatchResult.query
+    if match_ids is not None:
+        query = query.filter(MatchResult.id.in_(match_ids))
+    page = keyset_paginate(MatchResult, query, per_page, before=before, after=after, descending=False)
+    if not page.has_newer or not number:
+        first = 1
+    elif after is not None:
+        first = max(number - len(page.items) + 1, 1)
+    else:
+        first = number
+    page.items = [build_group(first + i, match, players, player_count)
+                  for i, (match, players) in enumerate(_with_players(page.items))]
+    return page
+
+
+def build_group(group_no, match, players, player_count=1):
+    t1_players = [p.name for p in players if p.team_name == match.team1]
+    t2_players = [p.name for p in players if p.team_name == match.team2]
+    # Eski kayıtlarda team_name olmayabilir, fallback:
+    if not t1_players or not t2_players:
+        t1_players = [p.name for i, p in enumerate(players) if i < player_count]
+        t2_players = [p.name for i, p in enumerate(players) if i >= player_count]
+    return {
+        "group_no": group_no,
+        "date": match.date,
+        "time": match.time,  # Saat bilgisi
+        "kickoff": match.kickoff.isoformat() if match.kickoff else None,
+        "team1": match.team1,
+        "team2": match.team2,
+        "t1_players": t1_players,
+        "t2_players": t2_players,
+        "match_id": match.id
+    }
+
+
+# Serbest metin tarih ve saatten başlama zamanı; eski kayıtlarda görülen
+# gün.ay.yıl gibi biçimler de okunur. Okunamayan tarih için None.
+DATE_FORMATS = ('%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y')
+TIME_FORMATS = ('%H:%M', '%H:%M:%S', '%H.%M')
+
+
+def parse_kickoff(date, time=None):
+    day = _parse_first((date or '').strip(), DATE_FORMATS)
+    if day is None:
+        return None
+    clock = _parse_first((time or '').strip(), TIME_FORMATS)
+    return datetime.combine(day.date(), clock.time() if clock else time_cls())
+
+
+def _parse_first(value, formats):
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+# Düzenlenen maçın oyuncu listesini yerinde günceller: aynı sıradaki
+# kayıtların adı/takımı değiştirilir, fazlası silinir, eksiği eklenir.
+# Her düzenlemede tüm oyuncuları silip yeniden eklemek yerine değişen
+# satırlara dokunur; boş sayfa ve değişiklik kaydı birikmez.
+def sync_players(match, t1_players, t2_players):
+    wanted = [(name, match.team1) for name in t1_players] + [(name, match.team2) for name in t2_players]
+    existing = list(match.players)
+    for player, (name, team_name) in zip(existing, wanted):
+        if player.name != name or player.team_name != team_name:
+            player.name, player.team_name = name, team_name
+    for player in existing[len(wanted):]:
+        match.players.remove(player)
+    for name, team_name in wanted[len(existing):]:
+        match.players.append(Player(name=name, team_name=team_name))
+
+
+# Maçları id sırasıyla partiler halinde (parti başına 2 sorgu) üretir;
+# büyük fikstür listeleri belleğe tamamen alınmadan akıtılabilir
+def iter_fixtures(player_count=1, batch_size=500):
+    last_id, group_no = 0, 0
+    while True:
+        matches = (
+            MatchResult.query.filter(MatchResult.id > last_id)
+            .order_by(MatchResult.id).limit(batch_size).all()
+        )
+        if not matches:
+            return
+        for match, players in _with_players(matches):
+            group_no += 1
+            yield build_group(group_no, match, players, player_count)
+        last_id = matches[-1].id
+
+
+# Sadece verilen maçlar (grup numarası bilinmez, None döner)
+def fixtures_by_id(match_ids, player_count=1, batch_size=500):
+    for i in range(0, len(match_ids), batch_size):
+        matches = (
+            MatchResult.query.filter(MatchResult.id.in_(match_ids[i:i + batch_size]))
+            .order_by(MatchResult.id).all()
+        )
+        for match, players in _with_players(matches):
+            yield build_group(None, match, players, player_count)
+
+
+def _with_players(matches):
+    players_by_match = defaultdict(list)
+    players = Player.query.filter(Player.team_id.in_([m.id for m in matches])).order_by(Player.id)
+    for p in players:
+        players_by_match[p.team_id].append(p)
+    return [(match, players_by_match[match.id]) for match in matches]
+
+
+# --- Toplu fikstür yazımı ---
+
+# CSV/JSON başlıkları; Türkçe başlıklar da kabul edilir
+FIELD_ALIASES = {
+    'date': 'date', 'tarih': 'date',
+    'time': 'time', 'saat': 'time',
+    'team1': 'team1', 'takim1': 'team1',
+    'team2': 'team2', 'takim2': 'team2',
+    'team1_players': 't1_players', 'takim1_oyunculari': 't1_players',
+    'team2_players': 't2_players', 'takim2_oyunculari': 't2_players',
+}
+# Bir hücredeki oyuncu adları bu karakterle ayrılır (CSV ayırıcısı , veya ; olabilir)
+PLAYER_SEPARATOR = '|'
+NAME_MAX = 50
+
+
+# CSV ayırıcısını tahmin etmek için bakılan satır sayısı
+SNIFF_LINES = 10
+
+
+# CSV veya JSON dosyasındaki kayıtları (satır no, sözlük) olarak döner
+def read_records(filename, stream, list_key='fixtures'):
+    data = stream.read()
+    if isinstance(data, bytes):
+        data = data.decode('utf-8-sig')
+    if filename.lower().endswith('.json'):
+        items = json.loads(data)
+        if isinstance(items, dict):
+            items = items.get(list_key)
+        if not isinstance(items, list):
+            raise ValueError(f"JSON bir liste ya da '{list_key}' listesi içeren bir nesne olmalı")
+        return list(enumerate(items, 1))
+    # Ayırıcı ilk birkaç satırdan çıkarılır; tek sütunlu dosyada ayırıcı
+    # bulunamaz, varsayılan virgül
+    sample = '\n'.join(data.splitlines()[:SNIFF_LINES])
+    try:
+        dialect = csv.Sniffer().sniff(sample or ',', delimiters=',;')
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(io.StringIO(data, newline=''), dialect=dialect)
+    # Boş satırlar atlanır, tırnaklı hücreler birden çok satıra yayılabilir;
+    # satır no kaydın bittiği fiziksel satırdır
+    return [(reader.line_num, item) for item in reader]
+
+
+def parse_fixture_file(filename, stream):
+    return [(row_no, _normalize(item)) for row_no, item in read_records(filename, stream)]
+
+
+def _normalize(item):
+    if not isinstance(item, dict):
+        return {}
+    row = {}
+    for key, value in item.items():
+        field = FIELD_ALIASES.get((key or '').strip().lower())
+        if field is None:
+            continue
+        if field in ('t1_players', 't2_players'):
+            if isinstance(value, str):
+                value = value.split(PLAYER_SEPARATOR)
+            row[field] = [str(p).strip() for p in (value or []) if str(p).strip()]
+        else:
+            row[field] = str(value).strip() if value is not None else ''
+    return row
+
+
+# Tüm satırları doğrular; herhangi bir satır hatalıysa hiçbir şey yazılmaz
+def validate_fixtures(numbered_rows):
+    rows, errors = [], []
+    for row_no, row in numbered_rows:
+        problems = []
+        team1, team2 = row.get('team1', ''), row.get('team2', '')
+        if not team1 or not team2:
+            problems.append('iki takım adı da zorunlu')
+        elif team1 == team2:
+            problems.append('takım kendisiyle eşleşemez')
+        if any(len(name) > NAME_MAX for name in [team1, team2] + row.get('t1_players', []) + row.get('t2_players', [])):
+            problems.append(f'isimler en fazla {NAME_MAX} karakter olabilir')
+        try:
+            date_cls.fromisoformat(row.get('date', ''))
+        except ValueError:
+            problems.append('tarih YYYY-AA-GG biçiminde olmalı')
+        if row.get('time'):
+            try:
+                time_cls.fromisoformat(row['time'])
+            except ValueError:
+                problems.append('saat SS:DD biçiminde olmalı')
+        if problems:
+            errors.append((row_no, ', '.join(problems)))
+        else:
+            rows.append(row)
+    return rows, errors
+
+
+# Maçları ve oyuncularını tek işlemde, toplu INSERT ile yazar (tek commit).
+# Satırlar bir üreteçten de gelebilir; bellekte en fazla bir parti tutulur.
+def insert_fixtures(rows, batch_size=1000):
+    rows = iter(rows)
+    added = 0
+    try:
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            added += _insert_batch(batch)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return added
+
+
+def _insert_batch(rows):
+    match_ids = db.session.scalars(
+        insert(MatchResult).returning(MatchResult.id, sort_by_parameter_order=True),
+        [{'team1': r['team1'], 'team2': r['team2'], 'date': r['date'], 'time': r.get('time'),
+          'kickoff': parse_kickoff(r['date'], r.get('time'))} for r in rows]
+    ).all()
+    players = []
+    for match_id, row in zip(match_ids, rows):
+        players += [{'name': name, 'team_id': match_id, 'team_name': row['team1']} for name in row.get('t1_players', [])]
+        players += [{'name': name, 'team_id': match_id, 'team_name': row['team2']} for name in row.get('t2_players', [])]
+    if players:
+        db.session.execute(insert(Player), players)
+    return len(match_ids)
+
+
+# Dosyayı okur, doğrular ve hatasızsa tamamını yazar; (eklenen, hatalar) döner
+def import_fixtures(filename, stream, dry_run=False):
+    try:
+        numbered_rows = parse_fixture_file(filename, stream)
+    except (ValueError, csv.Error) as e:
+        return 0, [(0, f'dosya okunamadı: {e}')]
+    rows, errors = validate_fixtures(numbered_rows)
+    if not rows and not errors:
+        errors.append((0, 'dosyada maç bulunamadı'))
+    if errors or dry_run:
+        return 0, errors
+    return insert_fixtures(rows), []
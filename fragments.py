@@ -0,0 +1,71 @@
+from flask import current_app, render_template
+from markupsafe import Markup
+from cache import FragmentCache, read_version
+from fixtures import fixture_page
+from models import Announcement, AboutBox
+from pagination import keyset_paginate
+from schedule import day_label, group_by_day, upcoming_matches
+from search import matching_match_ids
+
+# index.html ve admin.html'in ortak bölümleri önbelleğe alınmış şablon
+# parçaları olarak render edilir:  {{ fragment('fixtures', editable=True) }}
+# Her parça bağlı olduğu verinin sürümüyle (cache.CONTENT_PARTS) anahtarlanır;
+# örneğin chat mesajı ya da fotoğraf yüklemesi fikstür tablosunu yeniden
+# render ettirmez. Veri de sadece önbellek kaçırıldığında yüklenir.
+# Parametreler anahtarın parçasıdır; kullanıcıya özel değerler (rol vb.)
+# şablona değil parametre olarak verilmelidir.
+ANNOUNCEMENTS_PER_PAGE = 20
+
+fragment_cache = FragmentCache()
+_fragments = {}
+
+
+def fragment_loader(name, template, versions):
+    def decorator(load):
+        _fragments[name] = (template, versions, load)
+        return load
+    return decorator
+
+
+def render_fragment(name, **params):
+    template, versions, load = _fragments[name]
+    key = (name, tuple(read_version(v) for v in versions), tuple(sorted(params.items())))
+    html = fragment_cache.get(key)
+    metrics = current_app.extensions.get('metrics')
+    if metrics is not None:
+        result = 'miss' if html is None else 'hit'
+        metrics.metrics.inc('fragment_cache_requests_total', (('fragment', name), ('result', result)))
+    if html is None:
+        html = Markup(render_template(template, **params, **load(**params)))
+        fragment_cache.set(key, html)
+    return html
+
+
+# q: arama sorgusu; sadece adında ya da oyuncularında geçen maçlar listelenir
+@fragment_loader('fixtures', '_fixtures.html', ('fixtures',))
+def _fixtures(endpoint, editable=False, player_count=1, before=None, after=None, number=None, q=None):
+    match_ids = matching_match_ids(q) if q else None
+    if q and match_ids is None:
+        # Çok kısa ya da kelime içermeyen sorgu: sonuç yok
+        match_ids = []
+    page = fixture_page(before=before, after=after, match_ids=match_ids, player_count=player_count, number=number)
+    return {'groups': page.items, 'fixtures_page': page}
+
+
+# Güne göre gruplu yaklaşan maçlar; 'bugün' anahtarın parçası olduğundan
+# gün dönünce parça yeniden render edilir
+@fragment_loader('schedule', '_schedule.html', ('fixtures',))
+def _schedule(today):
+    days = group_by_day(upcoming_matches(today))
+    return {'days': [(day, day_label(day, today), matches) for day, matches in days]}
+
+
+@fragment_loader('announcements', '_announcements.html', ('announcements',))
+def _announcements(endpoint, can_delete=False, before=None, after=None):
+    page = keyset_paginate(Announcement, Announcement.query, ANNOUNCEMENTS_PER_PAGE, before=before, after=after)
+    return {'announcements': page.items, 'announcements_page': page}
+
+
+@fragment_loader('about', '_about.html', ('about',))
+def _about(can_edit=False):
+    return {'about': AboutBox.query.first()}
@@ -0,0 +1,62 @@
+# Üretim sunucusu ayarları:  gunicorn -c gunicorn.conf.py
+#
+# Ortam değişkenleri:
+#   GUNICORN_BIND          dinlenecek adres (varsayılan 0.0.0.0:8000)
+#   GUNICORN_WORKERS       worker sayısı (varsayılan çekirdek * 2 + 1, en fazla 12)
+#   GUNICORN_WORKER_CLASS  sync / gthread / gevent; CHAT_LIVE_MODE=sse ise gthread
+#   GUNICORN_THREADS       gthread worker başına iş parçacığı (varsayılan 4)
+#   GUNICORN_PRELOAD       0 verilirse uygulama her worker'da ayrı yüklenir
+#   TRUSTED_PROXIES        önündeki ters vekil sayısı (nginx arkasında 1); istemci IP'si X-Forwarded-For'dan
+#   METRICS_TOKEN          /metrics için Bearer token; verilmezse /metrics kapalı (404)
+#   SLOW_REQUEST_MS        bu süreyi aşan istekler SQL cümleleriyle loglanır (0: kapalı)
+import multiprocessing
+import os
+import time
+
+_started = time.perf_counter()
+
+wsgi_app = 'app:create_app()'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# SSE canlı chat bağlantıyı uzun süre açık tutar; sync worker'ı kilitler
+worker_class = os.environ.get(
+    'GUNICORN_WORKER_CLASS', 'gthread' if os.environ.get('CHAT_LIVE_MODE') == 'sse' else 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', 4 if worker_class == 'gthread' else 1))
+# Veritabanı havuzu iş parçacığı sayısına göre boyutlanır (database.engine_options)
+os.environ['GUNICORN_THREADS'] = str(threads)
+
+# SQLite tek yazıcılıdır; çekirdek sayısı ne olursa olsun worker sayısı sınırlı
+workers = int(os.environ.get('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 12)))
+
+# Uygulama ana süreçte bir kez yüklenir, worker'lar fork ile kopyalar:
+# import ve create_app maliyeti worker başına tekrar ödenmez
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+# Bellek sızıntılarına karşı worker'lar ara sıra yenilenir (hepsi aynı anda değil)
+max_requests = 2000
+max_requests_jitter = 200
+
+
+def when_ready(server):
+    server.log.info('Sunucu hazır: %.0f ms (preload=%s)', (time.perf_counter() - _started) * 1000, preload_app)
+
+
+def post_worker_init(worker):
+    from app import warmup
+    from jobs import job_queue
+    from models import db
+    started = time.perf_counter()
+    app = worker.wsgi
+    # Ana süreçte açılmış bağlantılar fork sonrası paylaşılmasın; kapatmadan bırak
+    with app.app_context():
+        db.engine.dispose(close=False)
+    timings = warmup(app)
+    # Önceki worker'dan kalan işler ilk isteği beklemeden devam etsin
+    job_queue.start()
+    worker.log.info(
+        'Worker %s ısındı: %.0f ms (kurulum %.0f ms, şablon %.0f ms, veritabanı %.0f ms, önbellek %.0f ms)',
+        worker.pid, (time.perf_counter() - started) * 1000, app.config['STARTUP_SECONDS'] * 1000,
+        timings['templates'] * 1000, timings['database'] * 1000, timings['caches'] * 1000)
@@ -0,0 +1,85 @@
+import os
+from flask import current_app
+from PIL import Image, ImageOps
+from models import db, Photo
+from cache import bump_content_version
+from jobs import job_queue
+
+# Galeride kullanılan türev boyutları (genişlik, piksel)
+THUMB_WIDTH = 400
+MEDIUM_WIDTH = 1280
+WEBP_QUALITY = 80
+DERIVED_FIELDS = ('width', 'height', 'thumb_url', 'thumb_width', 'thumb_height',
+                  'medium_url', 'medium_width', 'medium_height')
+
+
+def derived_folder(app):
+    return os.path.join(app.config['UPLOAD_FOLDER'], 'derived')
+
+
+def local_path(url):
+    # Sadece bizim yüklediğimiz dosyalar işlenir, dış URL'ler olduğu gibi kalır
+    if not url or not url.startswith('/static/uploads/'):
+        return None
+    path = url.lstrip('/')
+    return path if os.path.isfile(path) else None
+
+
+# Yükleme isteğini bekletmemek için türevler iş kuyruğunda üretilir
+def schedule_derivatives(photo_ids):
+    for photo_id in photo_ids:
+        job_queue.enqueue('photo_derivatives', photo_id=photo_id)
+
+
+@job_queue.task('photo_derivatives', max_attempts=3)
+def process_photo(photo_id):
+    if generate_derivatives(current_app, db.session.get(Photo, photo_id)):
+        db.session.commit()
+        bump_content_version('photos')
+        return True
+    return False
+
+
+def generate_derivatives(app, photo):
+    if photo is None:
+        return False
+    src = local_path(photo.url)
+    if src is None:
+        return False
+    # Aynı dosyayı gösteren başka bir kayıt için türevler zaten üretildiyse onları kullan
+    twin = Photo.query.filter(Photo.url == photo.url, Photo.id != photo.id, Photo.thumb_url.isnot(None)).first()
+    if twin:
+        for field in DERIVED_FIELDS:
+            setattr(photo, field, getattr(twin, field))
+        return True
+    os.makedirs(derived_folder(app), exist_ok=True)
+    stem = os.path.splitext(os.path.basename(src))[0]
+    with Image.open(src) as img:
+        # GIF'lerde ilk kare statik poster olarak kullanılır
+        img.seek(0)
+        frame = ImageOps.exif_transpose(img)
+        frame = frame.convert('RGBA' if _has_alpha(frame) else 'RGB')
+        photo.width, photo.height = frame.size
+        photo.thumb_url, photo.thumb_width, photo.thumb_height = _render(app, frame, stem, 'thumb', THUMB_WIDTH)
+        if frame.width > THUMB_WIDTH:
+            photo.medium_url, photo.medium_width, photo.medium_height = _render(app, frame, stem, 'medium', MEDIUM_WIDTH)
+        else:
+            # Zaten küçük olan görsel için ikinci bir kopya üretme
+            photo.medium_url, photo.medium_width, photo.medium_height = photo.thumb_url, photo.thumb_width, photo.thumb_height
+    return True
+
+
+def _has_alpha(img):
+    return img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info)
+
+
+def _render(app, frame, stem, suffix, max_width):
+    im = frame.copy()
+    # Küçük görseller büyütülmez
+    if im.width > max_width:
+        im = im.resize((max_width, max(1, round(im.height * max_width / im.width))), Image.LANCZOS)
+    # Türevler kaynak dosyanın adına (içerik özeti) bağlı, aynı dosya için bir kez üretilir
+    filename = '%s_%s.webp' % (stem, suffix)
+    save_path = os.path.join(derived_folder(app), filename)
+    im.save(save_path, 'WEBP', quality=WEBP_QUALITY, method=4)
+    return '/' + save_path.replace('\\', '/'), im.width, im.height
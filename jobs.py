@@ -0,0 +1,233 @@
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, or_, select, update
+from models import db, Job
+
+# Yavaş yan işler (fotoğraf türevleri, dosya temizliği, toplu silmeler) için
+# süreç içi iş kuyruğu. İşler 'job' tablosuna yazılır, her worker'daki
+# birkaç iş parçacığı sırayla alır. Alma tek bir UPDATE ... RETURNING
+# olduğundan aynı işi iki worker birden alamaz. Hata veren iş artan
+# beklemeyle yeniden denenir, max_attempts dolunca 'failed' olur. Worker'ı
+# çalışırken ölen işler LEASE_SECONDS sonra yeniden alınır; bu yüzden iş
+# fonksiyonları iki kez çalışsa da sorun çıkarmayacak şekilde yazılmalı.
+# Worker'ı öldüren (bellek, Pillow çökmesi, zaman aşımında SIGKILL) iş de
+# her seferinde bir deneme harcar; denemeleri bitmiş süresi dolmuş işler
+# yeniden alınmaz, 'failed' olarak işaretlenir.
+#
+#   @job_queue.task('delete_files')
+#   def delete_files(paths): ...
+#   job_queue.enqueue('delete_files', paths=[...])
+#
+# JOB_WORKERS (ayar ya da ortam değişkeni) worker başına iş parçacığı
+# sayısıdır; 0 verilirse işler sadece 'flask run-jobs' ile çalışır.
+LEASE_SECONDS = 600
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 3600
+# Biten işler bu kadar gün sonra silinir
+KEEP_FINISHED_DAYS = 7
+PRUNE_INTERVAL = 3600
+# Süresi dolmuş son denemelerin 'failed' yapılma sıklığı
+EXPIRE_INTERVAL = 60
+
+
+def worker_id():
+    return '%s:%d' % (socket.gethostname(), os.getpid())
+
+
+def retry_delay(attempts):
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+class JobQueue:
+    def __init__(self, workers=2, poll_interval=2.0):
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._app = None
+        self._handlers = {}
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._last_prune = 0.0
+        self._last_expire = 0.0
+
+    def init_app(self, app):
+        self._app = app
+        self.workers = int(app.config.get('JOB_WORKERS', os.environ.get('JOB_WORKERS', self.workers)))
+        # İş parçacıkları ana süreçte değil ilk istekte başlar; preload ile
+        # ana süreçte başlatılanlar fork sonrası worker'a geçmez
+        app.before_request(self.start)
+        atexit.register(self.stop)
+
+    def task(self, kind, max_attempts=5):
+        def decorator(func):
+            self._handlers[kind] = (func, max_attempts)
+            return func
+        return decorator
+
+    def enqueue(self, kind, delay=0, **payload):
+        _, max_attempts = self._handlers[kind]
+        now = datetime.now()
+        job = Job(kind=kind, payload=json.dumps(payload), max_attempts=max_attempts,
+                  run_after=now + timedelta(seconds=delay), created_at=now)
+        db.session.add(job)
+        db.session.flush()
+        job_id = job.id
+        db.session.commit()
+        self._wakeup.set()
+        return job_id
+
+    # --- Worker iş parçacıkları ---
+
+    def start(self):
+        if self.workers <= 0:
+            return
+        if self._pid == os.getpid() and len(self._threads) == self.workers and all(t.is_alive() for t in self._threads):
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._threads = []
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name='jobs-%d' % len(self._threads), daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=5.0):
+        if self._pid != os.getpid() or not self._threads:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        # Yarıda kalan işler lease süresini beklemeden sıraya döner
+        with self._app.app_context():
+            db.session.execute(
+                update(Job).where(Job.status == 'running', Job.locked_by == worker_id())
+                .values(status='queued', locked_by=None, locked_at=None)
+                .execution_options(synchronize_session=False))
+            db.session.commit()
+
+    def _run(self):
+        while not self._stopping:
+            try:
+                if self.run_next():
+                    continue
+            except Exception:
+                # Tablo henüz yok (migrate edilmemiş) ya da veritabanı kilitli
+                self._app.logger.exception('İş kuyruğu okunamadı')
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def run_next(self):
+        with self._app.app_context():
+            job = self._claim()
+            if job is None:
+                self._fail_expired()
+                self._prune()
+                return False
+            self._execute(job)
+            return True
+
+    def run_pending(self):
+        done = 0
+        while self.run_next():
+            done += 1
+        return done
+
+    def _claim(self):
+        now = datetime.now()
+        candidate = (
+            select(Job.id)
+            .where(or_(
+                and_(Job.status == 'queued', Job.run_after <= now),
+                and_(Job.status == 'running', Job.locked_at < now - timedelta(seconds=LEASE_SECONDS),
+                     Job.attempts < Job.max_attempts),
+            ))
+            .order_by(Job.run_after, Job.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        job = db.session.execute(
+            update(Job).where(Job.id == candidate)
+            .values(status='running', locked_by=worker_id(), locked_at=now, attempts=Job.attempts + 1)
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts)
+            .execution_options(synchronize_session=False)
+        ).first()
+        db.session.commit()
+        return job
+
+    def _execute(self, job):
+        handler = self._handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError('Bilinmeyen iş türü: %s' % job.kind)
+            result = handler[0](**json.loads(job.payload or '{}'))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            self._app.logger.exception('İş başarısız: #%d %s (deneme %d/%d)',
+                                       job.id, job.kind, job.attempts, job.max_attempts)
+            error = traceback.format_exc(limit=5)
+            if job.attempts < job.max_attempts:
+                values = {'status': 'queued', 'locked_by': None, 'locked_at': None, 'last_error': error,
+                          'run_after': datetime.now() + timedelta(seconds=retry_delay(job.attempts))}
+            else:
+                values = {'status': 'failed', 'last_error': error, 'finished_at': datetime.now()}
+        else:
+            values = {'status': 'done', 'finished_at': datetime.now(),
+                      'result': json.dumps(result) if result is not None else None}
+        # Lease dolup iş başka worker'a geçtiyse sonucu o yazar
+        db.session.execute(
+            update(Job).where(Job.id == job.id, Job.locked_by == worker_id()).values(**values)
+            .execution_options(synchronize_session=False))
+        db.session.commit()
+
+    def _fail_expired(self):
+        if time.monotonic() - self._last_expire < EXPIRE_INTERVAL:
+            return
+        self._last_expire = time.monotonic()
+        now = datetime.now()
+        db.session.execute(
+            update(Job).where(Job.status == 'running', Job.attempts >= Job.max_attempts,
+                              Job.locked_at < now - timedelta(seconds=LEASE_SECONDS))
+            .values(status='failed', locked_by=None, finished_at=now,
+                    last_error='lease expired: son denemede worker düştü ya da iş takıldı')
+            .execution_options(synchronize_session=False))
+        db.session.commit()
+
+    def _prune(self):
+        if time.monotonic() - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = time.monotonic()
+        db.session.execute(delete(Job).where(
+            Job.status.in_(('done', 'failed')),
+            Job.finished_at < datetime.now() - timedelta(days=KEEP_FINISHED_DAYS)))
+        db.session.commit()
+
+
+def job_dict(job):
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'attempts': job.attempts,
+        'max_attempts': job.max_attempts,
+        'run_after': job.run_after.isoformat(),
+        'created_at': job.created_at.isoformat(),
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'result': json.loads(job.result) if job.result else None,
+        'last_error': job.last_error,
+    }
+
+
+job_queue = JobQueue()
@@ -0,0 +1,39 @@
+import json
+import sqlite3
+import time
+
+
+# SQLite'ın PRAGMA data_version değeri, başka bir bağlantı (başka bir gunicorn
+# worker'ı dahil) veritabanına commit ettiğinde değişir. Böylece dinleyiciler
+# tablo okumadan, sadece bu sayacı yoklayarak yeni veri olup olmadığını anlar.
+class ChangeWatcher:
+    def __init__(self, database, interval=0.5):
+        self.interval = interval
+        self._conn = sqlite3.connect(database, check_same_thread=False)
+        self._version = self._read()
+
+    def _read(self):
+        return self._conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            version = self._read()
+            if version != self._version:
+                self._version = version
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        self._conn.close()
+
+
+def sse_event(data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append('id: %s' % event_id)
+    lines.append('data: %s' % json.dumps(data, ensure_ascii=False))
+    return '\n'.join(lines) + '\n\n'
@@ -0,0 +1,163 @@
+import atexit
+import threading
+import time
+from collections import deque, OrderedDict
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, case, delete, select
+from sqlalchemy.dialects.sqlite import insert
+from jobs import job_queue
+from models import db, LoginAttempt, LoginAttemptDaily
+
+
+# Giriş denemelerini her istekte ayrı commit etmek yerine bellekte biriktirip
+# toplu halde (tek executemany ile) yazar. Kuyruk boyut ya da süre dolunca,
+# ayrıca süreç kapanırken boşaltılır.
+class LoginAttemptWriter:
+    def __init__(self, batch_size=100, interval=2.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._app = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def init_app(self, app):
+        self._app = app
+        atexit.register(self.flush)
+
+    def record(self, username, success, timestamp=None):
+        with self._lock:
+            self._pending.append({
+                'username': username,
+                'success': bool(success),
+                'timestamp': timestamp or datetime.now()
+            })
+            full = len(self._pending) >= self.batch_size
+            # Fork sonrası (gunicorn worker) iş parçacığı yeniden başlatılır
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='login-log', daemon=True)
+                self._thread.start()
+        if full:
+            self._wakeup.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return 0
+        with self._app.app_context():
+            try:
+                db.session.execute(LoginAttempt.__table__.insert(), rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                # Yazılamayan kayıtlar kaybolmasın, bir sonraki turda tekrar denenir
+                with self._lock:
+                    self._pending[:0] = rows
+                self._app.logger.exception('Giriş logları yazılamadı (%d kayıt)', len(rows))
+                return 0
+        return len(rows)
+
+
+# Kayan pencereli başarısız deneme sınırı: (kullanıcı adı, IP), IP ve
+# hesap başına. Sadece hatalı denemeler sayılır. Tek bir IP'den gelen
+# denemeler hesabı düşük sınırla ((kullanıcı adı, IP)) kilitler, böylece
+# başka bir adresteki sahibi girebilir; hesabın tüm IP'lerden toplamı
+# (dağıtık deneme) ayrıca daha yüksek bir sınırla tutulur. Sınırı aşan
+# istekler veritabanına hiç dokunmadan reddedilir.
+# Sayaçlar worker belleğindedir. Ters vekil arkasında IP'nin doğru gelmesi
+# için TRUSTED_PROXIES ayarlanmalı (app.py).
+class LoginThrottle:
+    def __init__(self, per_user_ip=10, per_ip=30, per_username=100, window=300, max_keys=10000):
+        self.limits = {'user_ip': per_user_ip, 'ip': per_ip, 'user': per_username}
+        self.window = window
+        self.max_keys = max_keys
+        self._hits = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, username, ip):
+        now = time.monotonic()
+        with self._lock:
+            return all(len(self._recent(key, now)) < self.limits[key[0]] for key in self._keys(username, ip))
+
+    def failed(self, username, ip):
+        now = time.monotonic()
+        with self._lock:
+            for key in self._keys(username, ip):
+                self._recent(key, now).append(now)
+                self._hits.move_to_end(key)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+
+    def reset(self, username, ip):
+        with self._lock:
+            self._hits.pop(('user_ip', (username, ip)), None)
+
+    @staticmethod
+    def _keys(username, ip):
+        return [('user_ip', (username, ip)), ('ip', ip), ('user', username)]
+
+    def _recent(self, key, now):
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+        while hits and now - hits[0] > self.window:
+            hits.popleft()
+        return hits
+
+
+# Belirtilen günden eski denemeleri günlük toplamlara aktarıp siler
+def rollup_login_attempts(keep_days=30):
+    cutoff = datetime.combine(date.today() - timedelta(days=keep_days), datetime.min.time())
+    day = func.date(LoginAttempt.timestamp)
+    rows = (
+        db.session.query(
+            day,
+            func.sum(case((LoginAttempt.success.is_(True), 1), else_=0)),
+            func.sum(case((LoginAttempt.success.is_(True), 0), else_=1))
+        )
+        .filter(LoginAttempt.timestamp < cutoff)
+        .group_by(day)
+        .all()
+    )
+    for day_str, successes, failures in rows:
+        stmt = insert(LoginAttemptDaily).values(
+            day=date.fromisoformat(day_str), successes=successes, failures=failures
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LoginAttemptDaily.day],
+            set_={
+                'successes': LoginAttemptDaily.successes + stmt.excluded.successes,
+                'failures': LoginAttemptDaily.failures + stmt.excluded.failures
+            }
+        )
+        db.session.execute(stmt)
+    deleted = LoginAttempt.query.filter(LoginAttempt.timestamp < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+
+# Tüm logları tek DELETE ile silmek büyük tabloda yazıcıları uzun süre
+# bekletir; iş kuyruğunda parça parça, her parça ayrı işlemde silinir.
+# İş kuyruğa alındıktan sonra gelen denemeler (id > up_to_id) silinmez.
+@job_queue.task('delete_login_attempts')
+def delete_login_attempts(up_to_id, batch_size=5000):
+    deleted = 0
+    while True:
+        ids = select(LoginAttempt.id).where(LoginAttempt.id <= up_to_id).limit(batch_size)
+        count = db.session.execute(delete(LoginAttempt).where(LoginAttempt.id.in_(ids))).rowcount
+        db.session.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
@@ -0,0 +1,95 @@
+import os
+from datetime import datetime
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.exc import OperationalError
+from jobs import job_queue
+from models import db, Admin, AdminChat, Job, MatchResult, Player
+
+# Veritabanı bakımı: yetim kayıtların temizliği, silinen satırlardan kalan
+# boş sayfaların dosyaya geri verilmesi (auto_vacuum=INCREMENTAL) ve
+# tablo/sayfa istatistikleri. 'db_maintenance' işi her çalıştığında bir
+# sonrakini MAINTENANCE_INTERVAL sonrasına kurar; ilki 'flask migrate' ile
+# kuyruğa alınır.
+MAINTENANCE_INTERVAL = 6 * 3600
+# Bir turda geri verilen en fazla sayfa; yazma kilidi kısa sürsün
+VACUUM_PAGES = 2000
+AUTO_VACUUM_MODES = {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}
+
+
+# Yabancı anahtarlar açıkken yetim oluşmaz; toplu silmeler ya da anahtarlar
+# açılmadan önce yazılmış kayıtlar için
+def sweep_orphans():
+    players = db.session.execute(delete(Player).where(or_(
+        Player.team_id.is_(None), Player.team_id.not_in(select(MatchResult.id))))).rowcount
+    chats = db.session.execute(
+        update(AdminChat)
+        .where(AdminChat.admin_id.isnot(None), AdminChat.admin_id.not_in(select(Admin.id)))
+        .values(admin_id=None)
+        .execution_options(synchronize_session=False)).rowcount
+    db.session.commit()
+    return {'player': players, 'admin_chat': chats}
+
+
+def incremental_vacuum(pages=VACUUM_PAGES):
+    if db.engine.dialect.name != 'sqlite':
+        return 0
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        before = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+        # Pragma her sayfa için sütunsuz bir satır döner; execute() ilk
+        # adımda durur, executescript() ise cümleyi sonuna kadar çalıştırır
+        cursor.executescript('PRAGMA incremental_vacuum(%d);' % int(pages))
+        after = cursor.execute('PRAGMA freelist_count').fetchone()[0]
+        # Dosya, WAL'daki sayfalar ana dosyaya aktarılınca küçülür
+        cursor.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchall()
+    finally:
+        raw.close()
+    return before - after
+
+
+def database_stats():
+    conn = db.session.connection()
+    pragma = lambda name: conn.exec_driver_sql('PRAGMA %s' % name).scalar()
+    path = db.engine.url.database
+    stats = {
+        'page_size': pragma('page_size'),
+        'page_count': pragma('page_count'),
+        'freelist_count': pragma('freelist_count'),
+        'auto_vacuum': AUTO_VACUUM_MODES.get(pragma('auto_vacuum')),
+        'file_bytes': os.path.getsize(path) if path and os.path.exists(path) else None,
+        'wal_bytes': os.path.getsize(path + '-wal') if path and os.path.exists(path + '-wal') else None,
+        'tables': {},
+    }
+    names = [row[0] for row in conn.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+    for name in names:
+        stats['tables'][name] = {'rows': conn.exec_driver_sql('SELECT COUNT(*) FROM "%s"' % name).scalar()}
+    # dbstat sanal tablosu derlemede yoksa sadece satır sayıları verilir;
+    # indeksler tablo gibi ayrı satırda görünür
+    try:
+        rows = conn.exec_driver_sql(
+            'SELECT name, COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat GROUP BY name').fetchall()
+    except OperationalError:
+        rows = []
+    for name, pages, size, unused in rows:
+        stats['tables'].setdefault(name, {}).update({'pages': pages, 'bytes': size, 'unused_bytes': unused})
+    return stats
+
+
+def schedule_maintenance(delay=MAINTENANCE_INTERVAL):
+    pending = Job.query.filter_by(kind='db_maintenance', status='queued').first()
+    if pending is None:
+        return job_queue.enqueue('db_maintenance', delay=delay)
+    return pending.id
+
+
+@job_queue.task('db_maintenance', max_attempts=3)
+def run_maintenance():
+    # Bir sonraki tur önce kurulur; bu tur başarısız olsa da zincir kopmaz
+    schedule_maintenance()
+    started = datetime.now()
+    swept = sweep_orphans()
+    freed = incremental_vacuum()
+    return {'orphans': swept, 'freed_pages': freed,
+            'seconds': round((datetime.now() - started).total_seconds(), 3)}
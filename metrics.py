@@ -0,0 +1,276 @@
+import atexit
+import hmac
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from flask import Response, abort, before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from models import db
+
+try:
+    import fcntl
+except ImportError:  # Windows: ölü worker dosyaları birleştirilmez
+    fcntl = None
+
+# İstek süresi, SQL sayısı/süresi, şablon render süresi ve yükleme baytları.
+# Her worker ölçümlerini bellekte toplar ve en fazla FLUSH_INTERVAL saniyede
+# bir instance/metrics/<pid>.json dosyasına yazar; /metrics tüm dosyaları
+# toplayıp Prometheus metin biçiminde döner. Kapanmış worker'ların sayaçları
+# archived.json'da birikir, böylece toplamlar geriye gitmez.
+#
+# Ortam değişkenleri:
+#   SLOW_REQUEST_MS  bu süreyi aşan istekler SQL cümleleriyle loglanır (0: kapalı)
+#   METRICS_TOKEN    /metrics 'Authorization: Bearer <token>' ister; verilmezse
+#                    /metrics kapalıdır (404), uç nokta trafiği ve SQL süreleri açığa çıkmaz
+FLUSH_INTERVAL = 1.0
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Yavaş istek logunda tutulan en fazla SQL cümlesi ve uzunluğu
+SLOW_LOG_STATEMENTS = 50
+SLOW_LOG_STATEMENT_CHARS = 500
+
+HELP = {
+    'http_requests_total': ('counter', 'İşlenen istek sayısı'),
+    'http_request_duration_seconds': ('histogram', 'İstek işleme süresi'),
+    'db_queries_total': ('counter', 'İstekler sırasında çalışan SQL cümlesi sayısı'),
+    'db_query_seconds_total': ('counter', 'İstekler sırasında SQL cümlelerinde geçen süre'),
+    'template_render_seconds': ('histogram', 'Şablon render süresi'),
+    'upload_bytes_total': ('counter', 'Yüklenen (multipart) istek gövdesi baytları'),
+    'fragment_cache_requests_total': ('counter', 'Şablon parçası önbelleği isabet/kaçırma sayısı'),
+}
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+
+    def inc(self, name, labels, value=1):
+        with self._lock:
+            self.counters[(name, labels)] += value
+
+    def observe(self, name, labels, value, buckets=LATENCY_BUCKETS):
+        with self._lock:
+            h = self.histograms.get((name, labels))
+            if h is None:
+                h = self.histograms[(name, labels)] = {'buckets': [0] * (len(buckets) + 1), 'sum': 0.0, 'count': 0}
+            index = next((i for i, bound in enumerate(buckets) if value <= bound), len(buckets))
+            h['buckets'][index] += 1
+            h['sum'] += value
+            h['count'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, list(labels), value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, list(labels), h['buckets'], h['sum'], h['count']]
+                               for (name, labels), h in self.histograms.items()],
+            }
+
+
+def merge_snapshots(snapshots):
+    merged = Metrics()
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get('counters', []):
+            merged.counters[(name, tuple(map(tuple, labels)))] += value
+        for name, labels, buckets, total, count in snapshot.get('histograms', []):
+            key = (name, tuple(map(tuple, labels)))
+            h = merged.histograms.get(key)
+            if h is None:
+                h = merged.histograms[key] = {'buckets': [0] * len(buckets), 'sum': 0.0, 'count': 0}
+            h['buckets'] = [a + b for a, b in zip(h['buckets'], buckets)]
+            h['sum'] += total
+            h['count'] += count
+    return merged
+
+
+def _labels(pairs, extra=()):
+    items = list(pairs) + list(extra)
+    if not items:
+        return ''
+    escape = lambda v: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{%s}' % ','.join('%s="%s"' % (k, escape(v)) for k, v in items)
+
+
+def render_prometheus(metrics):
+    lines = []
+    series = defaultdict(list)
+    for (name, labels), value in sorted(metrics.counters.items()):
+        series[name].append('%s%s %s' % (name, _labels(labels), repr(float(value))))
+    for (name, labels), h in sorted(metrics.histograms.items()):
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), h['buckets']):
+            cumulative += count
+            series[name].append('%s_bucket%s %d' % (name, _labels(labels, [('le', bound)]), cumulative))
+        series[name].append('%s_sum%s %s' % (name, _labels(labels), repr(h['sum'])))
+        series[name].append('%s_count%s %d' % (name, _labels(labels), h['count']))
+    for name, samples in series.items():
+        kind, text = HELP.get(name, ('untyped', name))
+        lines.append('# HELP %s %s' % (name, text))
+        lines.append('# TYPE %s %s' % (name, kind))
+        lines.extend(samples)
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsCollector:
+    def __init__(self):
+        self.metrics = Metrics()
+        self.folder = None
+        self.slow_ms = 0
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.folder = os.path.join(app.instance_path, 'metrics')
+        os.makedirs(self.folder, exist_ok=True)
+        self.slow_ms = float(os.environ.get('SLOW_REQUEST_MS', 0))
+        self.token = os.environ.get('METRICS_TOKEN')
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        before_render_template.connect(self._before_render, app)
+        template_rendered.connect(self._after_render, app)
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._before_cursor)
+            event.listen(db.engine, 'after_cursor_execute', self._after_cursor)
+        app.add_url_rule('/metrics', 'metrics', self.metrics_view)
+        atexit.register(self.flush)
+
+    # --- İstek ---
+
+    def _before_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_query_seconds = 0.0
+        g.metrics_statements = [] if self.slow_ms else None
+
+    def _after_request(self, response):
+        start = g.get('metrics_start')
+        if start is None:
+            return response
+        # Akışlı yanıtlarda (SSE, JSON akışı) gövde süresi dahil değildir
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or 'unknown'
+        labels = (('endpoint', endpoint), ('method', request.method))
+        self.metrics.inc('http_requests_total', labels + (('status', response.status_code),))
+        self.metrics.observe('http_request_duration_seconds', labels, elapsed)
+        if g.metrics_queries:
+            self.metrics.inc('db_queries_total', (('endpoint', endpoint),), g.metrics_queries)
+            self.metrics.inc('db_query_seconds_total', (('endpoint', endpoint),), g.metrics_query_seconds)
+        if request.content_length and (request.mimetype or '').startswith('multipart/'):
+            self.metrics.inc('upload_bytes_total', (('endpoint', endpoint),), request.content_length)
+        if self.slow_ms and elapsed * 1000 >= self.slow_ms:
+            self._log_slow(endpoint, elapsed)
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+        return response
+
+    def _log_slow(self, endpoint, elapsed):
+        from flask import current_app
+        statements = '\n'.join('  %7.1f ms  %s' % (seconds * 1000, sql) for seconds, sql in g.metrics_statements)
+        current_app.logger.warning(
+            'Yavaş istek: %s %s (%s) %.0f ms, %d sorgu / %.0f ms\n%s',
+            request.method, request.full_path.rstrip('?'), endpoint, elapsed * 1000,
+            g.metrics_queries, g.metrics_query_seconds * 1000, statements)
+
+    # --- Şablon ---
+
+    def _before_render(self, sender, template, context, **extra):
+        if has_request_context():
+            g.setdefault('metrics_templates', []).append(time.perf_counter())
+
+    def _after_render(self, sender, template, context, **extra):
+        stack = g.get('metrics_templates') if has_request_context() else None
+        if stack:
+            self.metrics.observe('template_render_seconds', (('template', template.name or '?'),),
+                                 time.perf_counter() - stack.pop())
+
+    # --- SQL ---
+
+    def _before_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+    def _after_cursor(self, conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get('metrics_query_start')
+        if not stack:
+            return
+        seconds = time.perf_counter() - stack.pop()
+        # Arka plan iş parçacıklarının sorguları isteğe yazılmaz
+        if not has_request_context() or g.get('metrics_start') is None:
+            return
+        g.metrics_queries += 1
+        g.metrics_query_seconds += seconds
+        if g.metrics_statements is not None and len(g.metrics_statements) < SLOW_LOG_STATEMENTS:
+            g.metrics_statements.append((seconds, ' '.join(statement.split())[:SLOW_LOG_STATEMENT_CHARS]))
+
+    # --- Worker'lar arası toplama ---
+
+    def flush(self):
+        if self.folder is None or not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_flush = time.monotonic()
+            path = os.path.join(self.folder, '%d.json' % os.getpid())
+            tmp_path = '%s.%d.tmp' % (path, threading.get_ident())
+            with open(tmp_path, 'w') as f:
+                json.dump(self.metrics.snapshot(), f)
+            os.replace(tmp_path, path)
+        except FileNotFoundError:
+            # Klasör kaldırılmış (geçici instance ile çalışan ölçüm betikleri)
+            pass
+        finally:
+            self._flush_lock.release()
+
+    def collect(self):
+        self.flush()
+        self._archive_dead_workers()
+        snapshots = []
+        for name in os.listdir(self.folder):
+            if name.endswith('.json'):
+                snapshots.append(_read_json(os.path.join(self.folder, name)))
+        return merge_snapshots(snapshots)
+
+    def _archive_dead_workers(self):
+        if fcntl is None:
+            return
+        with open(os.path.join(self.folder, '.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            dead = [name for name in os.listdir(self.folder)
+                    if name.endswith('.json') and name[:-5].isdigit() and not _pid_alive(int(name[:-5]))]
+            if not dead:
+                return
+            archive_path = os.path.join(self.folder, 'archived.json')
+            paths = [os.path.join(self.folder, name) for name in dead]
+            merged = merge_snapshots([_read_json(archive_path)] + [_read_json(p) for p in paths])
+            tmp_path = archive_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(merged.snapshot(), f)
+            os.replace(tmp_path, archive_path)
+            for path in paths:
+                os.remove(path)
+
+    def metrics_view(self):
+        if not self.token:
+            abort(404)
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), 'Bearer ' + self.token):
+            abort(403)
+        return Response(render_prometheus(self.collect()), mimetype='text/plain; version=0.0.4')
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
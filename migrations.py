@@ -0,0 +1,311 @@
+from datetime import datetime
+from sqlalchemy import create_engine, event, MetaData
+from models import db, Admin, Photo, LoginAttempt, LoginAttemptDaily, AdminChat, MatchResult, Player, ContentChange, Job
+from fixtures import parse_kickoff
+from search import fold_sql
+
+# Sıralı şema göçleri. Her göç bir kez, 'schema_version' tablosuna
+# kaydedilerek uygulanır. Göçler worker açılışında değil, ayrı bir CLI
+# adımında çalışır:  flask --app app migrate
+#
+# Yeni göç eklerken listenin sonuna yeni bir numara ile ekleyin; eski
+# göçleri değiştirmeyin. 1. göç ilk sürümün şemasını sabit DDL ile kurar
+# (modellerin bugünkü hâlinden değil); sonraki göçler hem yeni hem eski
+# veritabanında aynı adımlarla çalışır. Bir göçün modelden kurduğu tablo
+# sonradan sadece yeni bir göçle değiştirilmeli.
+MIGRATIONS = []
+
+
+def migration(version, name):
+    def decorator(func):
+        MIGRATIONS.append((version, name, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return decorator
+
+
+# --- Yardımcılar ---
+
+def table_columns(conn, table_name):
+    return {row[1] for row in conn.exec_driver_sql('PRAGMA table_info("%s")' % table_name)}
+
+
+def add_column(conn, model, column_name):
+    table = model.__table__
+    if column_name in table_columns(conn, table.name):
+        return
+    column = table.columns[column_name]
+    conn.exec_driver_sql('ALTER TABLE "%s" ADD COLUMN "%s" %s' % (
+        table.name, column.name, column.type.compile(conn.dialect)))
+
+
+def create_index(conn, model, index_name):
+    for index in model.__table__.indexes:
+        if index.name == index_name:
+            index.create(conn, checkfirst=True)
+            return
+    raise KeyError(index_name)
+
+
+# SQLite sütun tipi veya kısıt değişikliğini ALTER ile yapamaz; tablo
+# modeldeki güncel tanımla yeniden kurulur ve ortak sütunlar kopyalanır
+def rebuild_table(conn, model):
+    table = model.__table__
+    tmp_name = table.name + '__new'
+    metadata = MetaData()
+    # Yabancı anahtarların hedef tabloları da aynı metadata'da olmalı
+    for fk in table.foreign_keys:
+        fk.column.table.to_metadata(metadata)
+    tmp_table = table.to_metadata(metadata, name=tmp_name)
+    tmp_table.indexes.clear()
+    tmp_table.create(conn)
+    common = [c.name for c in table.columns if c.name in table_columns(conn, table.name)]
+    column_list = ', '.join('"%s"' % c for c in common)
+    conn.exec_driver_sql('INSERT INTO "%s" (%s) SELECT %s FROM "%s"' % (tmp_name, column_list, column_list, table.name))
+    conn.exec_driver_sql('DROP TABLE "%s"' % table.name)
+    conn.exec_driver_sql('ALTER TABLE "%s" RENAME TO "%s"' % (tmp_name, table.name))
+    for index in table.indexes:
+        index.create(conn, checkfirst=True)
+
+
+# --- Göçler ---
+
+# İlk sürümün şeması; göç sistemi öncesi kurulmuş veritabanlarında
+# tablolar zaten vardır
+BASE_TABLES = (
+    'CREATE TABLE IF NOT EXISTS match_result ('
+    'id INTEGER NOT NULL, team1 VARCHAR(50), team2 VARCHAR(50), date VARCHAR(20), time VARCHAR(10), '
+    'PRIMARY KEY (id))',
+    'CREATE TABLE IF NOT EXISTS admin ('
+    'id INTEGER NOT NULL, username VARCHAR(50), password VARCHAR(128), is_super BOOLEAN, is_founder BOOLEAN, '
+    'name VARCHAR(50), email VARCHAR(100), phone VARCHAR(20), PRIMARY KEY (id), UNIQUE (username))',
+    'CREATE TABLE IF NOT EXISTS login_attempt ('
+    'id INTEGER NOT NULL, username VARCHAR(50), success BOOLEAN, timestamp DATETIME, PRIMARY KEY (id))',
+    'CREATE TABLE IF NOT EXISTS announcement (id INTEGER NOT NULL, text VARCHAR(255), PRIMARY KEY (id))',
+    'CREATE TABLE IF NOT EXISTS photo (id INTEGER NOT NULL, url VARCHAR(255), PRIMARY KEY (id))',
+    'CREATE TABLE IF NOT EXISTS about_box ('
+    'id INTEGER NOT NULL, title VARCHAR(100), content TEXT, PRIMARY KEY (id))',
+    'CREATE TABLE IF NOT EXISTS player ('
+    'id INTEGER NOT NULL, name VARCHAR(50), team_id INTEGER, team_name VARCHAR(50), PRIMARY KEY (id), '
+    'FOREIGN KEY(team_id) REFERENCES match_result (id))',
+    'CREATE TABLE IF NOT EXISTS admin_chat ('
+    'id INTEGER NOT NULL, admin_id INTEGER, username VARCHAR(50), role VARCHAR(20), message VARCHAR(512), '
+    'timestamp DATETIME, PRIMARY KEY (id), FOREIGN KEY(admin_id) REFERENCES admin (id))',
+)
+
+
+@migration(1, 'Temel tablolar')
+def create_base_tables(conn):
+    for statement in BASE_TABLES:
+        conn.exec_driver_sql(statement)
+
+
+@migration(2, 'Fotoğraf türev ve içerik özeti sütunları')
+def add_photo_derivatives(conn):
+    for column in ('content_hash', 'width', 'height', 'thumb_url', 'thumb_width', 'thumb_height',
+                   'medium_url', 'medium_width', 'medium_height'):
+        add_column(conn, Photo, column)
+    create_index(conn, Photo, 'ix_photo_content_hash')
+
+
+@migration(3, 'Sayfalama ve oyuncu indeksleri')
+def add_listing_indexes(conn):
+    create_index(conn, LoginAttempt, 'ix_login_attempt_timestamp')
+    create_index(conn, AdminChat, 'ix_admin_chat_timestamp')
+    create_index(conn, Player, 'ix_player_team_id')
+
+
+# Kaynak tablo -> (değişiklik kaydında görünen tablo, satır sütunu).
+# Oyuncu değişiklikleri ait oldukları maçın değişikliği sayılır.
+CHANGE_TRIGGERS = {
+    'match_result': ('match_result', 'id'),
+    'player': ('match_result', 'team_id'),
+    'announcement': ('announcement', 'id'),
+    'photo': ('photo', 'id'),
+}
+
+
+def create_change_triggers(conn, source):
+    target, column = CHANGE_TRIGGERS[source]
+    for action, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+        conn.exec_driver_sql(
+            'CREATE TRIGGER IF NOT EXISTS "%s_%s_change" AFTER %s ON "%s" BEGIN '
+            'INSERT INTO content_change (table_name, row_id) VALUES (\'%s\', %s.%s); END'
+            % (source, action.lower(), action, source, target, row, column)
+        )
+
+
+@migration(4, 'İçerik değişiklik kaydı ve tetikleyicileri')
+def add_content_changes(conn):
+    ContentChange.__table__.create(conn, checkfirst=True)
+    for source in CHANGE_TRIGGERS:
+        create_change_triggers(conn, source)
+
+
+@migration(5, 'Arka plan iş kuyruğu')
+def add_job_queue(conn):
+    Job.__table__.create(conn, checkfirst=True)
+
+
+
+@migration(6, 'Oyuncu ve chat yabancı anahtarları (CASCADE / SET NULL)')
+def add_foreign_key_actions(conn):
+    # Yeniden kurulan tablo eski yetim kayıtlarla yabancı anahtar kontrolünden geçemez
+    conn.exec_driver_sql('DELETE FROM player WHERE team_id IS NULL OR team_id NOT IN (SELECT id FROM match_result)')
+    conn.exec_driver_sql('UPDATE admin_chat SET admin_id = NULL WHERE admin_id NOT IN (SELECT id FROM admin)')
+    rebuild_table(conn, Player)
+    rebuild_table(conn, AdminChat)
+    # DROP TABLE tablonun tetikleyicilerini de siler
+    create_change_triggers(conn, 'player')
+
+
+# Arama indeksi satırları (search.py): kaynak tablo -> (rowid, name, team,
+# label, kind, match_id) ifadeleri; ROW yerine NEW ya da OLD konur
+SEARCH_ROWS = {
+    'match_result': [
+        ('-2 * ROW.id', fold_sql('ROW.team1'), 'NULL', 'ROW.team1', "'team'", 'ROW.id'),
+        ('-2 * ROW.id - 1', fold_sql('ROW.team2'), 'NULL', 'ROW.team2', "'team'", 'ROW.id'),
+    ],
+    'player': [
+        ('ROW.id', fold_sql('ROW.name'), fold_sql('ROW.team_name'), 'ROW.name', "'player'", 'ROW.team_id'),
+    ],
+}
+SEARCH_COLUMNS = {'match_result': ('team1', 'team2'), 'player': ('name', 'team_name', 'team_id')}
+
+
+def create_search_triggers(conn, source):
+    rows = SEARCH_ROWS[source]
+    insert = lambda row: 'INSERT INTO search_index (rowid, name, team, label, kind, match_id) VALUES %s;' % ', '.join(
+        '(%s)' % ', '.join(values) for values in rows).replace('ROW.', row + '.')
+    delete = 'DELETE FROM search_index WHERE rowid IN (%s);' % ', '.join(values[0] for values in rows).replace('ROW.', 'OLD.')
+    for action, body in (
+        ('INSERT', insert('NEW')),
+        ('UPDATE OF %s' % ', '.join(SEARCH_COLUMNS[source]), delete + ' ' + insert('NEW')),
+        ('DELETE', delete),
+    ):
+        conn.exec_driver_sql('CREATE TRIGGER IF NOT EXISTS "%s_%s_search" AFTER %s ON "%s" BEGIN %s END' % (
+            source, action.split()[0].lower(), action, source, body))
+
+
+@migration(7, 'Takım ve oyuncu arama indeksi (FTS5)')
+def add_search_index(conn):
+    # Önek aramaları için 2 ve 3 harflik önek indeksleri
+    conn.exec_driver_sql(
+        'CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5('
+        "name, team, label UNINDEXED, kind UNINDEXED, match_id UNINDEXED, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+    # Sıralama: bm25 sütun ağırlıkları (name, team, label, kind, match_id);
+    # adında geçen, sadece takımında geçenden önce gelir
+    conn.exec_driver_sql("INSERT INTO search_index (search_index, rank) VALUES ('rank', 'bm25(10.0, 1.0, 0.0, 0.0, 0.0)')")
+    conn.exec_driver_sql('DELETE FROM search_index')
+    for source, rows in SEARCH_ROWS.items():
+        for values in rows:
+            conn.exec_driver_sql(
+                'INSERT INTO search_index (rowid, name, team, label, kind, match_id) SELECT %s FROM "%s" AS src'
+                % (', '.join(values).replace('ROW.', 'src.'), source))
+        create_search_triggers(conn, source)
+
+
+@migration(8, 'Maç başlama zamanı (kickoff) sütunu ve indeksi')
+def add_match_kickoff(conn):
+    add_column(conn, MatchResult, 'kickoff')
+    create_index(conn, MatchResult, 'ix_match_result_kickoff')
+    # Doldurma içerik değişikliği sayılmaz: API istemcileri tüm fikstürü
+    # yeniden indirmesin diye değişiklik tetikleyicisi bu sırada kapalı
+    conn.exec_driver_sql('DROP TRIGGER IF EXISTS "match_result_update_change"')
+    rows = conn.exec_driver_sql('SELECT id, date, time FROM match_result WHERE kickoff IS NULL').fetchall()
+    # SQLAlchemy'nin SQLite DateTime biçimi (mikrosaniyeli); karşılaştırmalar metin üzerinden
+    updates = [(kickoff.isoformat(sep=' ', timespec='microseconds'), match_id) for match_id, date, time in rows
+               for kickoff in [parse_kickoff(date, time)] if kickoff is not None]
+    if updates:
+        conn.exec_driver_sql('UPDATE match_result SET kickoff = ? WHERE id = ?', updates)
+    create_change_triggers(conn, 'match_result')
+
+
+# Önceden 1. göçteki create_all ile kurulurdu; o göçle kurulmuş
+# veritabanlarında tablo zaten vardır
+@migration(9, 'Günlük giriş denemesi özetleri')
+def add_login_attempt_daily(conn):
+    LoginAttemptDaily.__table__.create(conn, checkfirst=True)
+
+
+# --- Çalıştırıcı ---
+
+def _migration_engine(url):
+    # Göçler tek bir EXCLUSIVE işlemde çalışır: aynı anda başlatılan ikinci
+    # bir göç süreci kilidi bekler, sonra güncel sürümü görüp bir şey yapmaz
+    engine = create_engine(url, connect_args={'timeout': 60})
+
+    @event.listens_for(engine, 'connect')
+    def _connect(dbapi_connection, record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, 'begin')
+    def _begin(conn):
+        conn.exec_driver_sql('BEGIN EXCLUSIVE')
+
+    return engine
+
+
+def current_version(conn):
+    conn.exec_driver_sql(
+        'CREATE TABLE IF NOT EXISTS schema_version ('
+        'version INTEGER PRIMARY KEY, name VARCHAR(100), applied_at DATETIME)'
+    )
+    return conn.exec_driver_sql('SELECT COALESCE(MAX(version), 0) FROM schema_version').scalar()
+
+
+def run_migrations(dry_run=False):
+    engine = _migration_engine(db.engine.url)
+    applied = []
+    try:
+        with engine.begin() as conn:
+            version = current_version(conn)
+            for number, name, func in MIGRATIONS:
+                if number <= version:
+                    continue
+                applied.append((number, name))
+                if dry_run:
+                    continue
+                func(conn)
+                conn.exec_driver_sql(
+                    'INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)',
+                    (number, name, datetime.now().isoformat(sep=' '))
+                )
+        if not dry_run:
+            enable_incremental_vacuum(engine)
+    finally:
+        engine.dispose()
+    return applied
+
+
+# auto_vacuum sonradan açılırsa ancak tam bir VACUUM ile devreye girer. Bu
+# bir kez, göçlerle birlikte yapılır (büyük veritabanında uzun sürebilir);
+# sonrasında boş sayfalar maintenance.incremental_vacuum ile geri verilir.
+def enable_incremental_vacuum(engine):
+    if engine.dialect.name != 'sqlite':
+        return False
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        if cursor.execute('PRAGMA auto_vacuum').fetchone()[0] == 2:
+            return False
+        cursor.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        cursor.execute('VACUUM')
+        return True
+    finally:
+        raw.close()
+
+
+def seed_default_admins():
+    # Kurucu yoksa otomatik oluştur
+    if not Admin.query.filter_by(is_founder=True).first():
+        founder = Admin(username="marxe", password="ali12345", is_founder=True, is_super=True, name="Kurucu")
+        db.session.add(founder)
+        db.session.commit()
+    # Baş admin yoksa otomatik oluştur (artık kurucu yetkisi verilmez)
+    if not Admin.query.filter_by(username="fayfejder").first():
+        admin = Admin(username="fayfejder", password="ali12345", is_super=True, is_founder=False, name="Baş Admin")
+        db.session.add(admin)
+        db.session.commit()
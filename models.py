@@ -8,6 +8,13 @@ class MatchResult(db.Model):
     team2 = db.Column(db.String(50))
     date = db.Column(db.String(20))
     time = db.Column(db.String(10))  # Maç saati eklendi
+    # date/time metinlerinden türetilen başlama zamanı (saat yoksa gün başı);
+    # program sorguları bu indeks üzerinde aralık taraması yapar
+    kickoff = db.Column(db.DateTime, index=True)
+    # Maç silinince oyuncuları da silinir (veritabanında ON DELETE CASCADE;
+    # passive_deletes ile ORM oyuncuları silmek için ayrıca yüklemez)
+    players = db.relationship('Player', backref='match', order_by='Player.id',
+                              cascade='all, delete-orphan', passive_deletes=True)
 
 class Admin(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -24,12 +31,18 @@ class LoginAttempt(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(50))
     success = db.Column(db.Boolean)
-    timestamp = db.Column(db.DateTime)
+    timestamp = db.Column(db.DateTime, index=True)
+
+# Eski giriş denemelerinin günlük toplamları (rollup-logins komutu doldurur)
+class LoginAttemptDaily(db.Model):
+    day = db.Column(db.Date, primary_key=True)
+    successes = db.Column(db.Integer, default=0)
+    failures = db.Column(db.Integer, default=0)
 
 class Player(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50))
-    team_id = db.Column(db.Integer, db.ForeignKey('match_result.id'))
+    team_id = db.Column(db.Integer, db.ForeignKey('match_result.id', ondelete='CASCADE'), index=True)
     team_name = db.Column(db.String(50))  # Takım adı ekleniyor
 
 class Announcement(db.Model):
@@ -39,16 +52,55 @@ class Announcement(db.Model):
 class Photo(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     url = db.Column(db.String(255))
+    # Yüklenen dosyanın SHA-256 özeti; aynı özeti taşıyan kayıtlar tek dosyayı paylaşır
+    content_hash = db.Column(db.String(64), index=True)
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    # Galeri için küçük resim ve orta boy WebP türevleri (GIF'lerde statik ilk kare)
+    thumb_url = db.Column(db.String(255))
+    thumb_width = db.Column(db.Integer)
+    thumb_height = db.Column(db.Integer)
+    medium_url = db.Column(db.String(255))
+    medium_width = db.Column(db.Integer)
+    medium_height = db.Column(db.Integer)
 
 class AdminChat(db.Model):
     id = db.Column(db.Integer, primary_key=True)
-    admin_id = db.Column(db.Integer, db.ForeignKey('admin.id'))
+    # Admin silinse de mesaj kalır (kullanıcı adı ve rol mesajda saklı)
+    admin_id = db.Column(db.Integer, db.ForeignKey('admin.id', ondelete='SET NULL'))
     username = db.Column(db.String(50))
     role = db.Column(db.String(20))  # "Kurucu", "Baş Admin", "Admin"
     message = db.Column(db.String(512))
-    timestamp = db.Column(db.DateTime)
+    timestamp = db.Column(db.DateTime, index=True)
+
+# İçerik tablolarında değişen kayıtların sırası; migrations.py'deki
+# tetikleyiciler doldurur. JSON API'nin 'since' parametresi buna dayanır.
+class ContentChange(db.Model):
+    __table_args__ = {'sqlite_autoincrement': True}  # budamadan sonra sıra geri dönmesin
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(30))
+    row_id = db.Column(db.Integer)
+    changed_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
 
 class AboutBox(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(100))
     content = db.Column(db.Text)
+
+# Arka plan işleri (jobs.py). Kuyruk veritabanında durduğu için worker
+# yeniden başlasa da bekleyen işler kaybolmaz.
+class Job(db.Model):
+    __table_args__ = (db.Index('ix_job_status_run_after', 'status', 'run_after'),)
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text)  # JSON
+    status = db.Column(db.String(10), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_after = db.Column(db.DateTime, nullable=False)
+    locked_by = db.Column(db.String(50))
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    result = db.Column(db.Text)  # JSON
+    created_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
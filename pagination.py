@@ -0,0 +1,74 @@
+from sqlalchemy import tuple_
+from models import db
+
+
+# OFFSET ve COUNT(*) kullanmayan imleç (keyset) sayfalaması. Kayıtlar en
+# yeniden eskiye (order_column, id) sırasıyla listelenir; imleç olarak
+# sınırdaki kaydın id'si kullanılır, böylece sayfa maliyeti tablo
+# büyüdükçe artmaz. descending=False ile eskiden yeniye listelenir; bu
+# durumda da newer/after önceki, older/before sonraki sayfa demektir.
+class KeysetPage:
+    def __init__(self, items, newer_cursor=None, older_cursor=None):
+        self.items = items
+        self.newer_cursor = newer_cursor
+        self.older_cursor = older_cursor
+
+    @property
+    def has_newer(self):
+        return self.newer_cursor is not None
+
+    @property
+    def has_older(self):
+        return self.older_cursor is not None
+
+
+def keyset_paginate(model, query, per_page, before=None, after=None, order_column=None, descending=True):
+    columns = [model.id] if order_column is None else [order_column, model.id]
+    # Liste sırası ve tersi
+    forward = (lambda c: c.desc()) if descending else (lambda c: c.asc())
+    backward = (lambda c: c.asc()) if descending else (lambda c: c.desc())
+    pivot = after if after is not None else before
+    if pivot is not None:
+        values = _pivot_values(model, columns, pivot)
+        if values is None:
+            # İmleçteki kayıt silinmişse ilk sayfaya dön
+            before = after = None
+        elif (after is not None) == descending:
+            query = query.filter(_row(columns) > _row(values))
+        else:
+            query = query.filter(_row(columns) < _row(values))
+    if after is not None:
+        rows = query.order_by(*[backward(c) for c in columns]).limit(per_page + 1).all()
+        has_newer, has_older = len(rows) > per_page, True
+        items = list(reversed(rows[:per_page]))
+    else:
+        rows = query.order_by(*[forward(c) for c in columns]).limit(per_page + 1).all()
+        has_newer, has_older = before is not None, len(rows) > per_page
+        items = rows[:per_page]
+    if not items:
+        return KeysetPage(items)
+    return KeysetPage(
+        items,
+        newer_cursor=items[0].id if has_newer else None,
+        older_cursor=items[-1].id if has_older else None
+    )
+
+
+def _pivot_values(model, columns, pivot):
+    if len(columns) == 1:
+        return [pivot]
+    row = db.session.query(*columns).filter(model.id == pivot).first()
+    return list(row) if row else None
+
+
+def _row(values):
+    return values[0] if len(values) == 1 else tuple_(*values)
+
+
+def cursor_arg(args, name):
+    value = args.get(name, type=int)
+    return value if value and value > 0 else None
+
+
+def page_cursors(args, *names):
+    return {name: cursor_arg(args, name) for name in names}
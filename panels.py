@@ -0,0 +1,35 @@
+import zlib
+from flask import Response, make_response, request
+from flask_login import current_user
+from werkzeug.http import is_resource_modified
+from cache import read_version
+
+# Admin panosunun bölümleri (fikstür, duyurular, fotoğraflar, chat) kendi
+# uç noktalarından, sekmesi açıldığında ayrı ayrı yüklenir; pano sayfası
+# sadece iskeleti render eder. Her panelin doğrulayıcısı (ETag) bağlı olduğu
+# verinin sürüm dosyası, bakan admin ve yetki sürümü ile sorgu
+# parametrelerinden oluşur: değişmemiş panel veritabanına gitmeden 304 döner.
+#
+# Paneli değiştiren istekler panelden geldiyse (X-Requested-With: panel)
+# yönlendirme yerine sadece değişen paneli döner; düz form gönderimleri
+# eskisi gibi panoya yönlendirilir.
+PANEL_HEADER = 'panel'
+
+
+def wants_panel():
+    return request.headers.get('X-Requested-With') == PANEL_HEADER
+
+
+def panel_response(version_name, render):
+    if request.method != 'GET':
+        return make_response(render())
+    etag = '%s-%s-%s-%s-%x' % (version_name, read_version(version_name), current_user.id,
+                               read_version('admins'), zlib.crc32(request.query_string))
+    if not is_resource_modified(request.environ, etag=etag):
+        response = Response(status=304)
+    else:
+        response = make_response(render())
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
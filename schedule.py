@@ -0,0 +1,75 @@
+from datetime import date as date_cls, datetime, time as time_cls, timedelta
+from itertools import groupby
+from models import MatchResult
+
+# Maç programı: başlama zamanına (MatchResult.kickoff, indeksli) göre
+# aralık sorguları. Hepsi 'kickoff >= başlangıç [AND kickoff < bitiş]
+# ORDER BY kickoff, id' biçimindedir; SQLite bunu ix_match_result_kickoff
+# üzerinde aralık taraması ile yapar, tablo tamamen okunmaz. Tarihi
+# okunamayan (kickoff NULL) maçlar programda görünmez.
+UPCOMING_LIMIT = 100
+# Tarih aralığı sorgusunda izin verilen en uzun aralık
+MAX_RANGE_DAYS = 366
+
+
+def day_start(day):
+    return datetime.combine(day, time_cls())
+
+
+def matches_between(start, end, limit=None):
+    query = (
+        MatchResult.query
+        .filter(MatchResult.kickoff >= start, MatchResult.kickoff < end)
+        .order_by(MatchResult.kickoff, MatchResult.id)
+    )
+    return query.limit(limit).all() if limit else query.all()
+
+
+# Bugün ve sonrası; saati geçmiş de olsa bugünün maçları gün boyu listede kalır
+def upcoming_matches(today=None, limit=UPCOMING_LIMIT):
+    start = day_start(today or date_cls.today())
+    return (
+        MatchResult.query
+        .filter(MatchResult.kickoff >= start)
+        .order_by(MatchResult.kickoff, MatchResult.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def matches_on(day):
+    return matches_between(day_start(day), day_start(day + timedelta(days=1)))
+
+
+def todays_matches(today=None):
+    return matches_on(today or date_cls.today())
+
+
+DAY_NAMES = ('Pazartesi', 'Salı', 'Çarşamba', 'Perşembe', 'Cuma', 'Cumartesi', 'Pazar')
+MONTH_NAMES = ('Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
+               'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık')
+
+
+def day_label(day, today=None):
+    today = today or date_cls.today()
+    if day == today:
+        return 'Bugün'
+    if day == today + timedelta(days=1):
+        return 'Yarın'
+    return '%d %s %s' % (day.day, MONTH_NAMES[day.month - 1], DAY_NAMES[day.weekday()])
+
+
+# Maçları güne göre grupla: [(gün, [maç, ...]), ...]; liste kickoff sıralı gelmeli
+def group_by_day(matches):
+    return [(day, list(items)) for day, items in groupby(matches, key=lambda m: m.kickoff.date())]
+
+
+def schedule_dict(match):
+    return {
+        'id': match.id,
+        'team1': match.team1,
+        'team2': match.team2,
+        'date': match.date,
+        'time': match.time,
+        'kickoff': match.kickoff.isoformat(),
+    }
@@ -0,0 +1,73 @@
+import re
+from sqlalchemy import text
+from models import db
+
+# Takım ve oyuncu adlarında tam metin arama (SQLite FTS5). 'search_index'
+# tablosu migrations.py'deki tetikleyicilerle match_result ve player
+# tablolarıyla eş tutulur; uygulama ayrıca yazmaz.
+#
+# Tokenizer (unicode61, remove_diacritics 2) büyük/küçük harfi ve ç, ş, ğ,
+# ö, ü, İ gibi işaretli harfleri sadeleştirir; noktasız ı ise ayrı bir harf
+# sayıldığından hem indekste hem sorguda fold() ile i'ye çevrilir. Böylece
+# 'isik' de 'Işık' da 'IŞIK' da aynı kaydı bulur.
+#
+# rowid düzeni: oyuncu satırları player.id, takım satırları maç başına
+# -2*id (team1) ve -2*id-1 (team2); tetikleyiciler satırları rowid ile bulur.
+SEARCH_TABLE = 'search_index'
+SEARCH_LIMIT = 10
+SEARCH_MAX_LIMIT = 50
+# Sorguda dikkate alınan en fazla kelime ve en kısa sorgu
+MAX_TERMS = 6
+MIN_QUERY_CHARS = 2
+
+_TERM = re.compile(r'\w+')
+
+
+def fold(value):
+    return value.replace('ı', 'i').replace('İ', 'i')
+
+
+# SQL tarafındaki karşılığı (tetikleyiciler ve ilk doldurma)
+def fold_sql(expr):
+    return "replace(replace(%s, 'ı', 'i'), 'İ', 'i')" % expr
+
+
+# Kullanıcı girdisinden FTS5 sorgusu: her kelime önek olarak aranır ve
+# hepsi geçmeli ('gala yıl' -> "gala"* "yil"*). Tırnak ve işleçler
+# kelimeye girmediğinden girdi sorgu sözdizimini bozamaz.
+def match_expression(query):
+    query = (query or '').strip()
+    if len(query) < MIN_QUERY_CHARS:
+        return None
+    terms = _TERM.findall(fold(query))[:MAX_TERMS]
+    if not terms:
+        return None
+    return ' '.join('"%s"*' % term for term in terms)
+
+
+def search(query, limit=SEARCH_LIMIT):
+    expression = match_expression(query)
+    if expression is None:
+        return []
+    # Sıralama (tabloda kayıtlı 'rank' ayarı, göç 7) ve LIMIT önce indekste
+    # yapılır; sadece seçilen satırlar maçlarla birleştirilir
+    rows = db.session.execute(text(
+        'SELECT s.kind, s.label, s.match_id, m.team1, m.team2, m.date, m.time FROM ('
+        'SELECT kind, label, match_id, rank FROM search_index '
+        'WHERE search_index MATCH :expression ORDER BY rank LIMIT :limit'
+        ') AS s JOIN match_result AS m ON m.id = s.match_id ORDER BY s.rank'
+    ), {'expression': expression, 'limit': limit})
+    return [
+        {'kind': kind, 'name': label, 'match_id': match_id,
+         'team1': team1, 'team2': team2, 'date': date, 'time': time}
+        for kind, label, match_id, team1, team2, date, time in rows
+    ]
+
+
+# Eşleşen maçların id'leri için alt sorgu: MatchResult.id.in_(matching_match_ids(q))
+def matching_match_ids(query):
+    expression = match_expression(query)
+    if expression is None:
+        return None
+    return text('SELECT match_id FROM search_index WHERE search_index MATCH :expression').bindparams(
+        expression=expression).columns(match_id=db.Integer)
@@ -0,0 +1,115 @@
+import gzip
+import mimetypes
+import os
+import re
+from flask import Response, abort, current_app, request, send_file
+from flask.sessions import SecureCookieSessionInterface
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # isteğe bağlı; kurulu değilse sadece .gz üretilir
+    brotli = None
+
+# static/ altındaki dosyaların sunumu. İçerik özetiyle adlandırılmış dosyalar
+# (yüklemeler: <sha256>.jpg, türevler: <sha256>_thumb.webp) hiç değişmez,
+# bir yıl 'immutable' önbelleğe alınır (eski yüklemelerin 32 haneli rastgele
+# adları içerikten türemediği için sayılmaz); diğerleri kısa süreli ve koşullu
+# isteklerle doğrulanır. Range ve If-None-Match/If-Modified-Since desteği
+# send_file'dan gelir.
+#
+# STATIC_SENDFILE ile dosya gövdesi önündeki sunucuya bırakılabilir:
+#   x-sendfile : Apache/lighttpd (X-Sendfile başlığı, USE_X_SENDFILE)
+#   x-accel    : nginx (X-Accel-Redirect: STATIC_ACCEL_PREFIX + yol), örn.
+#                location /_static/ { internal; alias /srv/kura/static/; }
+HASHED_NAME = re.compile(r'^[0-9a-f]{64}(_[a-z]+)?\.[a-z0-9]+$')
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+DEFAULT_MAX_AGE = 3600
+# Önceden sıkıştırılmış kardeş dosyalar, tercih sırasıyla
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE = {'.css', '.js', '.mjs', '.svg', '.json', '.txt', '.html', '.xml', '.map'}
+
+
+def init_static(app):
+    mode = os.environ.get('STATIC_SENDFILE', '').lower()
+    app.config['STATIC_SENDFILE'] = mode
+    app.config['STATIC_ACCEL_PREFIX'] = os.environ.get('STATIC_ACCEL_PREFIX', '/_static/')
+    app.config['USE_X_SENDFILE'] = mode == 'x-sendfile'
+    app.view_functions['static'] = serve_static
+    app.session_interface = StaticSessionInterface()
+
+
+# Statik yanıtlarda oturum kaydedilmez; aksi halde eklenen 'Vary: Cookie'
+# başlığı CDN/proxy önbelleğini kullanıcı başına böler
+class StaticSessionInterface(SecureCookieSessionInterface):
+    def save_session(self, app, session, response):
+        if request.endpoint == 'static':
+            return
+        super().save_session(app, session, response)
+
+
+def is_immutable(filename):
+    return bool(HASHED_NAME.match(os.path.basename(filename)))
+
+
+def serve_static(filename):
+    path = safe_join(current_app.static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    max_age = IMMUTABLE_MAX_AGE if is_immutable(filename) else DEFAULT_MAX_AGE
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    if current_app.config['STATIC_SENDFILE'] == 'x-accel':
+        # Range ve koşullu istekleri nginx karşılar; biz sadece başlıkları veririz
+        response = Response(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = current_app.config['STATIC_ACCEL_PREFIX'] + filename
+        response.cache_control.max_age = max_age
+    else:
+        encoding, served = _precompressed(path)
+        response = send_file(served, mimetype=mimetype, conditional=True, max_age=max_age)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if os.path.splitext(path)[1].lower() in COMPRESSIBLE:
+            response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    if max_age == IMMUTABLE_MAX_AGE:
+        response.cache_control.immutable = True
+    return response
+
+
+def _precompressed(path):
+    accepted = request.accept_encodings
+    for encoding, suffix in PRECOMPRESSED:
+        if accepted[encoding] and os.path.isfile(path + suffix):
+            # Kaynak dosya sonradan değiştiyse eski sıkıştırılmış kopya kullanılmaz
+            if os.path.getmtime(path + suffix) >= os.path.getmtime(path):
+                return encoding, path + suffix
+    return None, path
+
+
+def variant_paths(path):
+    return [path + suffix for _, suffix in PRECOMPRESSED]
+
+
+# Sıkıştırılabilir dosyaların .gz (ve brotli kuruluysa .br) kopyalarını üretir
+def precompress_folder(folder, min_size=1024):
+    written = []
+    for root, _, names in os.walk(folder):
+        for name in names:
+            path = os.path.join(root, name)
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            variants = [('.gz', gzip.compress(data, 9, mtime=0))]
+            if brotli is not None:
+                variants.append(('.br', brotli.compress(data, quality=11)))
+            for suffix, compressed in variants:
+                # Kazanç yoksa kopya tutma
+                if len(compressed) >= len(data):
+                    continue
+                tmp_path = path + suffix + '.tmp'
+                with open(tmp_path, 'wb') as out:
+                    out.write(compressed)
+                os.replace(tmp_path, path + suffix)
+                written.append(path + suffix)
+    return written
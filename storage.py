@@ -0,0 +1,135 @@
+import hashlib
+import os
+import tempfile
+import time
+from werkzeug.utils import secure_filename
+from jobs import job_queue
+from sqlalchemy import or_
+from models import db, Photo
+from static_files import variant_paths
+
+CHUNK_SIZE = 64 * 1024
+TEMP_PREFIX = '.upload-'
+
+
+# Yüklemeyi parça parça geçici dosyaya yazarken SHA-256 özetini çıkarır ve
+# dosyayı özet adıyla saklar. Aynı içerik ikinci kez yüklenirse yeni kopya
+# oluşmaz, aynı isimli farklı dosyalar da birbirinin üzerine yazılmaz.
+# Dosya var olsa da geçici kopya yerine taşınır (aynı baytlar): eşzamanlı
+# bir release_file dosyayı kontrolden sonra silmiş olabilir.
+def store_upload(file, upload_folder):
+    ext = os.path.splitext(secure_filename(file.filename))[1].lower()
+    digest = hashlib.sha256()
+    fd, tmp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, suffix='.tmp', dir=upload_folder)
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+        content_hash = digest.hexdigest()
+        save_path = os.path.join(upload_folder, content_hash + ext)
+        os.replace(tmp_path, save_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return '/' + save_path.replace('\\', '/'), content_hash
+
+
+# Dosyayı (asıl yükleme ya da türev) gösteren kayıt sayısı. Sayım dosyanın
+# kendi adresiyle yapılır: aynı içerik .jpg ve .jpeg olarak yüklenmişse iki
+# ayrı dosyadır; türevler ise içerik özetiyle adlandırıldığından paylaşılır.
+def reference_count(url):
+    return Photo.query.filter(or_(Photo.url == url, Photo.thumb_url == url, Photo.medium_url == url)).count()
+
+
+# Referansı kalmayan dosyaları (ve sıkıştırılmış kopyalarını) diskten
+# kaldırır. Sayım her dosya için silmeden hemen önce yeniden yapılır; iş
+# kuyrukta beklerken aynı içerik yeniden yüklenmiş olabilir.
+def release_urls(urls):
+    removed = 0
+    for url in dict.fromkeys(filter(None, urls)):
+        path = _upload_path(url)
+        if path is None:
+            continue
+        # Sayım eski bir okuma anlık görüntüsünden yapılmasın
+        db.session.rollback()
+        if reference_count(url):
+            continue
+        removed += delete_files([path] + variant_paths(path))
+    return removed
+
+
+# Silinen fotoğrafın dosyası ve türevleri, başka kayıt göstermiyorsa
+@job_queue.task('release_file')
+def release_file(url, content_hash=None, derived_urls=()):
+    return release_urls((url,) + tuple(derived_urls))
+
+
+# Toplu silmede tüm dosyalar; her biri silinmeden önce yeniden sayılır.
+# Paylaşılabilen dosyalar için doğrudan delete_files kuyruğa alınmamalı.
+@job_queue.task('release_files')
+def release_files(urls):
+    return release_urls(urls)
+
+
+@job_queue.task('delete_files')
+def delete_files(paths):
+    removed = 0
+    for path in paths:
+        if os.path.isfile(path):
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def referenced_urls():
+    urls = set()
+    for row in db.session.query(Photo.url, Photo.thumb_url, Photo.medium_url).distinct():
+        urls.update(filter(None, row))
+    return urls
+
+
+def referenced_paths():
+    paths = set()
+    rows = db.session.query(Photo.url, Photo.thumb_url, Photo.medium_url).distinct()
+    for row in rows:
+        for file_url in row:
+            path = _upload_path(file_url)
+            if path:
+                paths.add(os.path.normpath(path))
+    return paths
+
+
+# Hiçbir Photo satırının göstermediği yükleme dosyalarını bulur (ve siler)
+def collect_garbage(upload_folder, dry_run=False, min_age=3600):
+    referenced = referenced_paths()
+    now = time.time()
+    removed = []
+    for folder in (upload_folder, os.path.join(upload_folder, 'derived')):
+        if not os.path.isdir(folder):
+            continue
+        for name in os.listdir(folder):
+            path = os.path.normpath(os.path.join(folder, name))
+            if not os.path.isfile(path) or path in referenced:
+                continue
+            # Önceden sıkıştırılmış kopyalar kaynak dosyayla birlikte yaşar
+            base, suffix = os.path.splitext(path)
+            if suffix in ('.gz', '.br') and base in referenced:
+                continue
+            # Devam eden yüklemelerin geçici dosyalarına dokunma
+            if now - os.path.getmtime(path) < min_age:
+                continue
+            if not dry_run:
+                os.remove(path)
+            removed.append(path)
+    return removed
+
+
+def _upload_path(url):
+    if not url or not url.startswith('/static/uploads/'):
+        return None
+    return url.lstrip('/')
@@ -0,0 +1,42 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# İlk sürümden kalan (göç sistemi öncesi) veritabanı
+LEGACY_DATABASE = os.path.join(ROOT, 'instance', 'kura.db')
+
+from app import create_app  # noqa: E402
+from models import db  # noqa: E402
+
+
+# Her çağrı kendi instance klasöründe yeni bir uygulama kurar. Varsayılan
+# olarak boş bir veritabanına göçler uygulanır; database verilirse o dosyanın
+# kopyası kullanılır, migrate=False ile göçler çalıştırılmaz.
+@pytest.fixture
+def make_app(tmp_path_factory):
+    apps = []
+
+    def factory(database=None, migrate=True):
+        root = tmp_path_factory.mktemp('app')
+        if database is not None:
+            shutil.copyfile(database, root / 'kura.db')
+        app = create_app({
+            'JOB_WORKERS': 0,
+            'INSTANCE_PATH': str(root / 'instance'),
+            'SQLALCHEMY_DATABASE_URI': 'sqlite:///%s' % (root / 'kura.db'),
+            'UPLOAD_FOLDER': str(root / 'uploads'),
+        })
+        if migrate:
+            result = app.test_cli_runner().invoke(args=['migrate'])
+            assert result.exception is None, result.output
+        apps.append(app)
+        return app
+
+    yield factory
+    for app in apps:
+        with app.app_context():
+            db.engine.dispose()
@@ -0,0 +1,121 @@
+import io
+from datetime import date
+
+import pytest
+from draw import DrawError, DrawRules, parse_team_file, solve_draw
+
+
+def team(name, pot=None, seed=None, club=''):
+    return {'name': name, 'pot': pot, 'seed': seed, 'club': club, 'players': []}
+
+
+# 16 takım: dört torba, her torbada dört kulüpten birer takım
+def pool(count=16):
+    return [team('T%02d' % i, pot=i % 4 + 1, club='K%d' % (i // 4)) for i in range(count)]
+
+
+def names(draw):
+    if draw.format == 'knockout':
+        return [(a['name'], b['name']) for a, b in draw.pairs]
+    return [[t['name'] for t in group] for group in draw.groups]
+
+
+@pytest.mark.parametrize('fmt', ['knockout', 'round_robin'])
+def test_same_seed_gives_same_draw(fmt):
+    first = solve_draw(pool(), fmt, seed=1234)
+    second = solve_draw(pool(), fmt, seed=1234)
+    assert names(first) == names(second)
+    assert first.seed == 1234
+
+
+def test_different_seeds_give_different_draws():
+    draws = {tuple(names(solve_draw(pool(), 'knockout', seed=seed))) for seed in range(10)}
+    assert len(draws) > 1
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_knockout_has_no_same_pot_or_club_pairs(seed):
+    draw = solve_draw(pool(), 'knockout', seed=seed)
+    assert len(draw.pairs) == 8
+    for a, b in draw.pairs:
+        assert a['pot'] != b['pot']
+        assert a['club'] != b['club']
+    paired = [t['name'] for pair in draw.pairs for t in pair]
+    assert sorted(paired) == sorted(t['name'] for t in pool())
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_groups_have_no_same_pot_or_club(seed):
+    draw = solve_draw(pool(), 'round_robin', group_size=4, seed=seed)
+    assert len(draw.groups) == 4
+    for group in draw.groups:
+        assert len({t['pot'] for t in group}) == len(group)
+        assert len({t['club'] for t in group}) == len(group)
+
+
+def test_rules_can_be_relaxed():
+    teams = [team('A', pot=1), team('B', pot=1)]
+    with pytest.raises(DrawError):
+        solve_draw(teams, 'knockout', seed=1)
+    draw = solve_draw(teams, 'knockout', seed=1, rules=DrawRules(no_same_pot=False))
+    assert len(draw.pairs) == 1
+
+
+def test_odd_pool_gives_top_seed_a_bye():
+    teams = pool(6) + [team('S1', seed=1), team('S2', seed=2), team('S3', seed=3)]
+    draw = solve_draw(teams, 'knockout', seed=7)
+    assert [t['name'] for t in draw.byes] == ['S1']
+    assert len(draw.pairs) == 4
+    # Kalan seri başları birbiriyle eşleşmez
+    for a, b in draw.pairs:
+        assert not (a['seeded'] and b['seeded'])
+
+
+def test_odd_pool_without_seeds_has_one_bye():
+    draw = solve_draw(pool(7), 'knockout', seed=3)
+    assert len(draw.byes) == 1
+    assert len(draw.pairs) == 3
+
+
+def test_round_robin_fixtures_cover_every_pair_once():
+    teams = [team('T%d' % i, pot=i % 4 + 1) for i in range(8)]
+    draw = solve_draw(teams, 'round_robin', group_size=4, seed=5)
+    rows = list(draw.fixtures(date(2026, 11, 1), '18:00', interval_days=7))
+    assert len(rows) == draw.match_count == 12
+    for group in draw.groups:
+        group_names = {t['name'] for t in group}
+        played = {frozenset((r['team1'], r['team2'])) for r in rows if r['team1'] in group_names}
+        assert len(played) == len(group) * (len(group) - 1) // 2
+    assert {r['date'] for r in rows} == {'2026-11-01', '2026-11-08', '2026-11-15'}
+
+
+def test_too_few_teams_and_unknown_format():
+    with pytest.raises(DrawError):
+        solve_draw([team('A')], 'knockout', seed=1)
+    with pytest.raises(DrawError):
+        solve_draw(pool(), 'swiss', seed=1)
+
+
+def test_team_file_errors_are_reported_per_row():
+    data = 'name;pot;seed\nA;1;\nB;x;\nA;2;\n;3;\n'.encode()
+    teams, errors = parse_team_file('teams.csv', io.BytesIO(data))
+    assert [t['name'] for t in teams] == ['A']
+    assert errors == [(3, 'pot sayı olmalı'), (4, 'takım adı tekrar ediyor'), (5, 'takım adı zorunlu')]
+
+
+@pytest.mark.parametrize('filename, data', [
+    ('teams.csv', b'name\nA\nB\n'),
+    ('teams.json', b'[{"name": "A"}, {"name": "B"}]'),
+    ('teams.json', b'{"teams": [{"name": "A"}, {"name": "B"}]}'),
+])
+def test_team_file_formats(filename, data):
+    teams, errors = parse_team_file(filename, io.BytesIO(data))
+    assert errors == []
+    assert [t['name'] for t in teams] == ['A', 'B']
+
+
+@pytest.mark.parametrize('data', [b'5', b'"x"', b'{"teams": 3}', b'{bozuk'])
+def test_unreadable_team_file_is_a_file_error(data):
+    teams, errors = parse_team_file('teams.json', io.BytesIO(data))
+    assert teams == []
+    assert errors[0][0] == 0
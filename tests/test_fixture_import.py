@@ -0,0 +1,64 @@
+import io
+import json
+
+from fixtures import import_fixtures
+from models import MatchResult, Player
+
+VALID_CSV = (
+    'tarih;saat;takim1;takim2;takim1_oyunculari;takim2_oyunculari\n'
+    '2026-11-01;18:00;A;B;Ali|Veli;Can\n'
+    '\n'
+    '2026-11-02;19:30;"C\nSK";D;;Deniz|Ece\n'
+)
+
+
+def test_valid_csv_is_imported_with_players(make_app):
+    app = make_app()
+    with app.app_context():
+        before = MatchResult.query.count()
+        added, errors = import_fixtures('fikstur.csv', io.BytesIO(VALID_CSV.encode()))
+        assert (added, errors) == (2, [])
+        assert MatchResult.query.count() == before + 2
+        match = MatchResult.query.filter_by(team1='A').one()
+        assert match.kickoff.isoformat() == '2026-11-01T18:00:00'
+        assert sorted(p.name for p in match.players) == ['Ali', 'Can', 'Veli']
+        assert MatchResult.query.filter_by(team2='D').one().kickoff.isoformat() == '2026-11-02T19:30:00'
+
+
+def test_one_bad_row_rejects_the_whole_file(make_app):
+    app = make_app()
+    data = VALID_CSV + '2026-11-03;20:00;;F;;\n'
+    with app.app_context():
+        matches, players = MatchResult.query.count(), Player.query.count()
+        added, errors = import_fixtures('fikstur.csv', io.BytesIO(data.encode()))
+        assert added == 0
+        # Boş satır ve iki satıra yayılan hücreden sonra da satır no doğru
+        assert errors == [(6, 'iki takım adı da zorunlu')]
+        assert (MatchResult.query.count(), Player.query.count()) == (matches, players)
+
+
+def test_dry_run_validates_without_writing(make_app):
+    app = make_app()
+    with app.app_context():
+        before = MatchResult.query.count()
+        assert import_fixtures('fikstur.csv', io.BytesIO(VALID_CSV.encode()), dry_run=True) == (0, [])
+        assert MatchResult.query.count() == before
+
+
+def test_json_list_and_object_are_accepted(make_app):
+    app = make_app()
+    rows = [{'team1': 'A', 'team2': 'B', 'date': '2026-11-01', 'team1_players': ['Ali']}]
+    with app.app_context():
+        for data in (rows, {'fixtures': rows}):
+            added, errors = import_fixtures('f.json', io.BytesIO(json.dumps(data).encode()))
+            assert (added, errors) == (1, [])
+
+
+def test_unreadable_files_are_file_errors(make_app):
+    app = make_app()
+    with app.app_context():
+        for filename, data in (('f.json', b'5'), ('f.json', b'{"fixtures": "x"}'), ('f.json', b'{bozuk')):
+            added, errors = import_fixtures(filename, io.BytesIO(data))
+            assert added == 0
+            assert errors[0][0] == 0
+        assert import_fixtures('f.csv', io.BytesIO(b'tarih,takim1,takim2\n')) == (0, [(0, 'dosyada maç bulunamadı')])
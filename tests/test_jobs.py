@@ -0,0 +1,105 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import jobs
+from jobs import JobQueue, LEASE_SECONDS, worker_id
+from models import db, Job
+
+
+@pytest.fixture
+def queue(make_app):
+    app = make_app()
+    queue = JobQueue(workers=0)
+    queue.init_app(app)
+    calls = []
+
+    @queue.task('flaky', max_attempts=3)
+    def flaky(fail_times):
+        calls.append(fail_times)
+        if len(calls) <= fail_times:
+            raise RuntimeError('olmadı')
+        return len(calls)
+
+    queue.calls = calls
+    with app.app_context():
+        yield queue
+
+
+def job(job_id):
+    db.session.expire_all()
+    return db.session.get(Job, job_id)
+
+
+def run_due(queue, job_id):
+    # Yeniden deneme beklemesini atla
+    db.session.execute(db.update(Job).where(Job.id == job_id).values(run_after=datetime.now()))
+    db.session.commit()
+    return queue.run_pending()
+
+
+def test_successful_job_stores_result(queue):
+    job_id = queue.enqueue('flaky', fail_times=0)
+    assert queue.run_pending() == 1
+    assert (job(job_id).status, json.loads(job(job_id).result)) == ('done', 1)
+
+
+def test_failed_job_is_retried_with_backoff(queue):
+    job_id = queue.enqueue('flaky', fail_times=1)
+    before = datetime.now()
+    queue.run_pending()
+    row = job(job_id)
+    assert (row.status, row.attempts, row.locked_by) == ('queued', 1, None)
+    assert row.run_after >= before + timedelta(seconds=jobs.retry_delay(1))
+    assert 'olmadı' in row.last_error
+    # Bekleme dolmadan alınmaz
+    assert queue.run_pending() == 0
+    run_due(queue, job_id)
+    assert (job(job_id).status, job(job_id).attempts) == ('done', 2)
+
+
+def test_job_fails_after_max_attempts(queue):
+    job_id = queue.enqueue('flaky', fail_times=10)
+    for _ in range(3):
+        run_due(queue, job_id)
+    row = job(job_id)
+    assert (row.status, row.attempts) == ('failed', 3)
+    assert row.finished_at is not None
+    run_due(queue, job_id)
+    assert len(queue.calls) == 3
+
+
+def stale(queue, attempts):
+    job_id = queue.enqueue('flaky', fail_times=0)
+    db.session.execute(db.update(Job).where(Job.id == job_id).values(
+        status='running', attempts=attempts, locked_by='olu-worker:1',
+        locked_at=datetime.now() - timedelta(seconds=LEASE_SECONDS + 1)))
+    db.session.commit()
+    return job_id
+
+
+def test_expired_lease_is_claimed_again(queue):
+    job_id = stale(queue, attempts=1)
+    assert queue.run_pending() == 1
+    row = job(job_id)
+    assert (row.status, row.attempts, row.locked_by) == ('done', 2, worker_id())
+
+
+def test_expired_last_attempt_is_marked_failed(queue):
+    job_id = stale(queue, attempts=3)
+    queue._last_expire = 0.0
+    assert queue.run_pending() == 0
+    row = job(job_id)
+    assert (row.status, row.locked_by) == ('failed', None)
+    assert row.last_error.startswith('lease expired')
+    assert queue.calls == []
+
+
+def test_live_lease_is_not_taken(queue):
+    job_id = queue.enqueue('flaky', fail_times=0)
+    db.session.execute(db.update(Job).where(Job.id == job_id).values(
+        status='running', attempts=1, locked_by='diger-worker:1', locked_at=datetime.now()))
+    db.session.commit()
+    assert queue.run_pending() == 0
+    assert job(job_id).status == 'running'
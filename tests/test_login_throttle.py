@@ -0,0 +1,83 @@
+import pytest
+
+import views
+from loginlog import LoginThrottle
+from models import db, Admin
+
+
+def test_limits_per_account_and_ip():
+    throttle = LoginThrottle(per_user_ip=2, per_ip=4, per_username=5)
+    for _ in range(2):
+        assert throttle.allow('ali', '1.1.1.1')
+        throttle.failed('ali', '1.1.1.1')
+    assert not throttle.allow('ali', '1.1.1.1')
+    # Aynı hesap başka IP'den, başka hesap aynı IP'den denenebilir
+    assert throttle.allow('ali', '2.2.2.2')
+    assert throttle.allow('veli', '1.1.1.1')
+    throttle.failed('veli', '1.1.1.1')
+    throttle.failed('veli', '1.1.1.1')
+    # IP sınırı dolunca o IP'den hiçbir hesap denenemez
+    assert not throttle.allow('can', '1.1.1.1')
+
+
+def test_distributed_attempts_hit_the_account_limit():
+    throttle = LoginThrottle(per_user_ip=2, per_ip=4, per_username=5)
+    for i in range(5):
+        assert throttle.allow('ali', '10.0.0.%d' % i)
+        throttle.failed('ali', '10.0.0.%d' % i)
+    assert not throttle.allow('ali', '10.0.0.99')
+    assert throttle.allow('veli', '10.0.0.99')
+
+
+def test_success_resets_only_the_account_ip_counter():
+    throttle = LoginThrottle(per_user_ip=2, per_ip=3, per_username=100)
+    throttle.failed('ali', '1.1.1.1')
+    throttle.failed('ali', '1.1.1.1')
+    throttle.reset('ali', '1.1.1.1')
+    assert throttle.allow('ali', '1.1.1.1')
+    # Başarılı giriş IP sayacını sıfırlamaz; sınıra sayılmaya devam eder
+    throttle.failed('ali', '1.1.1.1')
+    assert not throttle.allow('veli', '1.1.1.1')
+
+
+def test_old_attempts_fall_out_of_the_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('loginlog.time.monotonic', lambda: now[0])
+    throttle = LoginThrottle(per_user_ip=1, window=300)
+    throttle.failed('ali', '1.1.1.1')
+    assert not throttle.allow('ali', '1.1.1.1')
+    now[0] += 301
+    assert throttle.allow('ali', '1.1.1.1')
+
+
+@pytest.fixture
+def client(make_app, monkeypatch):
+    monkeypatch.setattr(views, 'login_throttle', LoginThrottle(per_user_ip=3, per_ip=30, per_username=100))
+    app = make_app()
+    with app.app_context():
+        db.session.add(Admin(username='ali', password='dogru'))
+        db.session.commit()
+    return app.test_client()
+
+
+def login(client, password, ip='1.1.1.1'):
+    return client.post('/login', data={'username': 'ali', 'password': password},
+                       environ_base={'REMOTE_ADDR': ip})
+
+
+def test_login_route_returns_429_after_failures(client):
+    for _ in range(3):
+        assert login(client, 'yanlis').status_code == 200
+    # Sınır dolunca doğru parola da veritabanına gitmeden reddedilir
+    assert login(client, 'dogru').status_code == 429
+    assert login(client, 'dogru', ip='2.2.2.2').status_code == 302
+
+
+def test_successful_login_clears_the_counter(client):
+    for _ in range(2):
+        login(client, 'yanlis')
+    assert login(client, 'dogru').status_code == 302
+    client.get('/logout')
+    for _ in range(2):
+        assert login(client, 'yanlis').status_code == 200
+    assert login(client, 'dogru').status_code == 302
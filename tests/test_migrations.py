@@ -0,0 +1,87 @@
+import re
+import sqlite3
+
+from conftest import LEGACY_DATABASE
+from migrations import MIGRATIONS, run_migrations
+from models import db
+
+
+def schema(app):
+    with app.app_context():
+        path = db.engine.url.database
+    conn = sqlite3.connect(path)
+    try:
+        rows = conn.execute(
+            "SELECT type, name, sql FROM sqlite_master "
+            "WHERE name NOT LIKE 'sqlite_%' AND name NOT LIKE 'search_index_%'").fetchall()
+        columns = {name: [row[1] for row in conn.execute('PRAGMA table_info("%s")' % name)]
+                   for kind, name, _ in rows if kind == 'table' and name != 'search_index'}
+    finally:
+        conn.close()
+    return {(kind, name): normalize(sql) for kind, name, sql in rows}, columns
+
+
+# Elle yazılmış ve SQLAlchemy'nin ürettiği DDL arasındaki boşluk farkları
+def normalize(sql):
+    sql = re.sub(r'\s+', ' ', sql or '')
+    return re.sub(r'\( | \)', lambda m: m.group(0).strip(), sql)
+
+
+def applied_versions(app):
+    with app.app_context():
+        return [row[0] for row in db.session.execute(db.text('SELECT version FROM schema_version ORDER BY version'))]
+
+
+def test_fresh_database_gets_every_migration(make_app):
+    app = make_app()
+    assert applied_versions(app) == [number for number, _, _ in MIGRATIONS]
+
+
+def test_legacy_database_ends_with_the_same_schema(make_app):
+    fresh = make_app()
+    legacy = make_app(database=LEGACY_DATABASE)
+    fresh_sql, fresh_columns = schema(fresh)
+    legacy_sql, legacy_columns = schema(legacy)
+    assert set(fresh_sql) == set(legacy_sql)
+    # İlk sürümün veritabanında modelde olmayan about_box.visible sütunu var
+    legacy_columns['about_box'].remove('visible')
+    assert fresh_columns == legacy_columns
+    for key, sql in fresh_sql.items():
+        if key != ('table', 'about_box'):
+            assert sql == legacy_sql[key], key
+
+
+def test_migrations_run_once(make_app):
+    app = make_app()
+    with app.app_context():
+        assert run_migrations() == []
+        assert run_migrations(dry_run=True) == []
+
+
+def test_dry_run_lists_pending_without_applying(make_app):
+    app = make_app(database=LEGACY_DATABASE, migrate=False)
+    with app.app_context():
+        pending = run_migrations(dry_run=True)
+        assert [number for number, _ in pending] == [number for number, _, _ in MIGRATIONS]
+        assert run_migrations(dry_run=True) == pending
+
+
+def test_legacy_data_is_kept_and_backfilled(make_app):
+    conn = sqlite3.connect(LEGACY_DATABASE)
+    try:
+        matches = conn.execute('SELECT COUNT(*) FROM match_result').fetchone()[0]
+        players = conn.execute(
+            'SELECT COUNT(*) FROM player WHERE team_id IN (SELECT id FROM match_result)').fetchone()[0]
+    finally:
+        conn.close()
+    app = make_app(database=LEGACY_DATABASE)
+    with app.app_context():
+        execute = lambda sql: db.session.execute(db.text(sql)).scalar()
+        assert execute('SELECT COUNT(*) FROM match_result') == matches
+        assert execute('SELECT COUNT(*) FROM player') == players
+        # Arama indeksi mevcut takım ve oyuncularla doldurulur
+        assert execute("SELECT COUNT(*) FROM search_index WHERE kind = 'team'") == 2 * matches
+        assert execute("SELECT COUNT(*) FROM search_index WHERE kind = 'player'") == players
+        # Okunabilen tarihler için başlama zamanı doldurulur
+        assert execute('SELECT COUNT(*) FROM match_result WHERE kickoff IS NOT NULL') > 0
+        assert execute('PRAGMA auto_vacuum') == 2
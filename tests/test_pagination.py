@@ -0,0 +1,80 @@
+import pytest
+from fixtures import insert_fixtures
+from models import db, MatchResult
+from pagination import keyset_paginate
+
+
+@pytest.fixture
+def matches(make_app):
+    app = make_app()
+    with app.app_context():
+        MatchResult.query.delete()
+        insert_fixtures([{'team1': 'A%d' % i, 'team2': 'B%d' % i, 'date': '2026-11-01'} for i in range(7)])
+        ids = [m.id for m in MatchResult.query.order_by(MatchResult.id)]
+        yield ids
+
+
+def page(per_page=3, **cursors):
+    result = keyset_paginate(MatchResult, MatchResult.query, per_page, descending=False, **cursors)
+    return [m.id for m in result.items], result
+
+
+def test_pages_walk_forward_and_back(matches):
+    ids, first = page()
+    assert ids == matches[:3]
+    assert (first.has_newer, first.has_older) == (False, True)
+    ids, second = page(before=first.older_cursor)
+    assert ids == matches[3:6]
+    ids, last = page(before=second.older_cursor)
+    assert ids == matches[6:]
+    assert (last.has_newer, last.has_older) == (True, False)
+    ids, back = page(after=last.newer_cursor)
+    assert ids == matches[3:6]
+    assert (back.has_newer, back.has_older) == (True, True)
+    ids, start = page(after=back.newer_cursor)
+    assert ids == matches[:3]
+    assert start.has_newer is False
+
+
+def test_exact_multiple_has_no_empty_last_page(matches):
+    ids, first = page(per_page=7)
+    assert ids == matches
+    assert first.has_older is False
+
+
+def test_descending_is_newest_first(matches):
+    result = keyset_paginate(MatchResult, MatchResult.query, 3)
+    assert [m.id for m in result.items] == matches[::-1][:3]
+
+
+def test_order_column_ties_break_on_id(matches):
+    # Aynı başlama zamanlı maçlar id ile sıralanır; sayfa sınırında kayıp/tekrar olmaz
+    seen, cursor = [], None
+    while True:
+        result = keyset_paginate(MatchResult, MatchResult.query, 3, before=cursor,
+                                 order_column=MatchResult.kickoff, descending=False)
+        seen += [m.id for m in result.items]
+        if not result.has_older:
+            break
+        cursor = result.older_cursor
+    assert seen == matches
+
+
+def test_deleted_cursor_row_returns_first_page(matches):
+    _, first = page()
+    db.session.delete(db.session.get(MatchResult, first.older_cursor))
+    db.session.commit()
+    result = keyset_paginate(MatchResult, MatchResult.query, 3, before=first.older_cursor,
+                             order_column=MatchResult.kickoff, descending=False)
+    assert [m.id for m in result.items] == matches[:2] + matches[3:4]
+    assert result.has_newer is False
+
+
+def test_empty_table(make_app):
+    app = make_app()
+    with app.app_context():
+        MatchResult.query.delete()
+        db.session.commit()
+        ids, result = page()
+        assert ids == []
+        assert (result.has_newer, result.has_older) == (False, False)
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import event
+from cache import bump_content_version
+from fixtures import insert_fixtures
+from models import db, Admin
+
+
+# Sayfa başına en fazla sorgu; ana sayfa: fotoğraflar, fikstür maçları ve
+# oyuncuları, program, duyurular, Hakkında. Panel: maçlar ve oyuncuları.
+# Her render'da admin listesini yeniden okumak gibi gerilemeler bunu aşar.
+MAX_QUERIES = {'/': 6, '/admin/panels/fixtures': 3}
+
+
+def roster(match_no, side, size):
+    return ['Oyuncu %d%s-%d' % (match_no, side, n) for n in range(size)]
+
+
+# Kadrolar maçtan maça farklı büyüklükte (0-4 oyuncu); oyuncu yükleme
+# sorgusu gerçekten farklı sayıda satır döner
+def seed_matches(app, count):
+    with app.app_context():
+        insert_fixtures([
+            {'team1': 'Takım %dA' % i, 'team2': 'Takım %dB' % i, 'date': '2026-11-%02d' % (i % 28 + 1),
+             'time': '18:00', 't1_players': roster(i, 'A', i % 5), 't2_players': roster(i, 'B', (i + 2) % 5)}
+            for i in range(count)
+        ])
+        bump_content_version()
+
+
+def login_founder(app, client):
+    with app.app_context():
+        founder_id = Admin.query.filter_by(is_founder=True).first().id
+    with client.session_transaction() as session:
+        session['_user_id'] = str(founder_id)
+        session['_fresh'] = True
+
+
+def count_queries(app, client, url):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == 200
+    return len(statements)
+
+
+# Fikstür tablosu maç ve oyuncu sayısından bağımsız, sabit sayıda sorguyla
+# render edilmeli (maç başına oyuncu sorgusu, N+1 olmamalı)
+@pytest.mark.parametrize('url, logged_in', [('/', False), ('/admin/panels/fixtures', True)])
+def test_fixture_queries_do_not_grow_with_matches(make_app, url, logged_in):
+    counts = {}
+    for matches in (5, 50):
+        app = make_app()
+        seed_matches(app, matches)
+        client = app.test_client()
+        if logged_in:
+            login_founder(app, client)
+        counts[matches] = count_queries(app, client, url)
+    assert counts[5] == counts[50], counts
+    assert counts[50] <= MAX_QUERIES[url], counts
@@ -0,0 +1,960 @@
+from flask import Blueprint, abort, current_app, render_template, redirect, url_for, request, flash, g, make_response, Response, jsonify, stream_with_context
+from flask_login import login_user, login_required, logout_user, current_user
+from models import db, MatchResult, Admin, LoginAttempt, LoginAttemptDaily, Announcement, Photo, AdminChat, AboutBox, Job
+from fixtures import iter_fixtures, fixtures_by_id, insert_fixtures, import_fixtures, sync_players, parse_kickoff
+from api import json_api_response, change_version, since_arg, changed_ids, rows_by_id, prune_changes
+from fragments import render_fragment
+from draw import FORMATS, DrawError, DrawRules, solve_draw, parse_team_file
+from auth import AdminUser, remember_principal, invalidate_principals, role_required
+from cache import content_version, bump_content_version, bump_version, version_timestamp, PageCache
+from images import schedule_derivatives, generate_derivatives, local_path
+from pagination import keyset_paginate, cursor_arg, page_cursors
+from search import search, SEARCH_LIMIT, SEARCH_MAX_LIMIT
+from schedule import upcoming_matches, todays_matches, matches_between, day_start, schedule_dict, MAX_RANGE_DAYS
+from live import ChangeWatcher, sse_event
+from panels import panel_response, wants_panel
+from loginlog import LoginAttemptWriter, LoginThrottle, rollup_login_attempts
+from jobs import job_queue, job_dict
+from backup import backup_database, BACKUP_KEEP, BACKUP_PAGES
+from exports import export_lines, EXPORTS, EXPORT_FORMATS
+from maintenance import database_stats, incremental_vacuum, schedule_maintenance, sweep_orphans
+from migrations import run_migrations, seed_default_admins
+from static_files import precompress_folder
+from storage import store_upload, referenced_urls, collect_garbage
+from datetime import date, datetime, timedelta
+import os
+import time
+import zlib
+import click
+from werkzeug.http import is_resource_modified
+
+# Tüm sayfalar, API ve CLI komutları; uygulamaya create_app() içinde bağlanır
+bp = Blueprint('main', __name__, cli_group=None)
+bp.add_app_template_global(render_fragment, 'fragment')
+
+# Ziyaretçilere giden ana sayfanın içerik sürümüne bağlı önbelleği
+index_cache = PageCache()
+
+# Sayfa başına kayıt sayıları
+PHOTOS_PER_PAGE = 12
+CHAT_PER_PAGE = 50
+LOGS_PER_PAGE = 50
+# Arama kutusu ve /api/search sorgusunun en fazla uzunluğu
+SEARCH_QUERY_MAX = 100
+
+# Giriş denemeleri toplu yazılır, aşırı denemeler bellekte sınırlanır
+login_log = LoginAttemptWriter()
+login_throttle = LoginThrottle()
+
+@bp.before_app_request
+def before_request():
+    # Statik dosyalar için oturumdaki yetkiliyi yüklemeye gerek yok
+    if request.endpoint == 'static':
+        return
+    g.current_admin = current_user if current_user.is_authenticated else None
+
+@bp.route('/')
+def index():
+    cursors = page_cursors(request.args, 'photo_before', 'photo_after', 'ann_before', 'ann_after', 'fix_before', 'fix_after', 'fix_no')
+    q = search_query_arg()
+    # Giriş yapmış adminlerde sayfa kişiye özel (admin bilgi çubuğu), önbelleğe alınmaz
+    if current_user.is_authenticated:
+        return render_index(cursors, q)
+    version = content_version()
+    # Program sekmesi güne bağlı; gün dönünce sayfa değişmiş sayılır
+    today = date.today()
+    etag = '%s-%s-%s-%x' % (version, today.isoformat(), '-'.join(str(c or 0) for c in cursors.values()),
+                            zlib.crc32(q.encode('utf-8')))
+    last_modified = version_timestamp(version)
+    # Tarayıcı/proxy elindeki sürüm güncelse DB'ye hiç gitmeden 304 dön
+    if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = Response(status=304)
+    else:
+        cache_key = tuple(cursors.values()) + (q, today)
+        html = index_cache.get(version, cache_key)
+        if html is None:
+            html = render_index(cursors, q)
+            index_cache.set(version, cache_key, html)
+        response = make_response(html)
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.no_cache = True
+    return response
+
+def search_query_arg():
+    return request.args.get('q', '').strip()[:SEARCH_QUERY_MAX]
+
+def render_index(cursors, q=''):
+    # Fikstür, duyurular ve Hakkında kutusu şablonda önbellekli parçalar olarak
+    # render edilir (fragments.py); fotoğraflar imleçli sayfalama, COUNT(*) yok
+    photos_page = keyset_paginate(Photo, Photo.query, PHOTOS_PER_PAGE,
+                                  before=cursors['photo_before'], after=cursors['photo_after'])
+    return render_template(
+        'index.html',
+        cursors=cursors,
+        q=q,
+        today=date.today(),
+        background_url="https://c4.wallpaperflare.com/wallpaper/398/874/541/champions-league-stadium-wallpaper-preview.jpg",
+        photos=photos_page.items,
+        photos_page=photos_page
+    )
+
+# --- JSON okuma API'si (mobil istemciler ve skor ekranları) ---
+# Yanıtlar içerik sürümüne göre 304 döner; 'since' verilirse sadece o sürümden
+# sonra değişen kayıtlar ve silinen id'ler gelir.
+api_cache = PageCache()
+
+def delta_fields(name, table_name, since, version, load):
+    ids = changed_ids(table_name, since, version)
+    found = set()
+
+    def items():
+        for item in load(ids):
+            found.add(item['id'])
+            yield item
+    return [('version', version), ('full', False), ('since', since),
+            (name, items()), ('deleted', lambda: [i for i in ids if i not in found])]
+
+def fixture_dict(group):
+    item = dict(group, id=group['match_id'])
+    del item['match_id']
+    return item
+
+def announcement_dict(announcement):
+    return {'id': announcement.id, 'text': announcement.text}
+
+def photo_dict(photo):
+    return {
+        'id': photo.id, 'url': photo.url, 'width': photo.width, 'height': photo.height,
+        'thumb': {'url': photo.thumb_url, 'width': photo.thumb_width, 'height': photo.thumb_height} if photo.thumb_url else None,
+        'medium': {'url': photo.medium_url, 'width': photo.medium_width, 'height': photo.medium_height} if photo.medium_url else None,
+    }
+
+@bp.route('/api/fixtures')
+def api_fixtures():
+    def fields():
+        version, since = change_version(), since_arg()
+        if since is not None:
+            return delta_fields('fixtures', 'match_result', since, version,
+                                lambda ids: map(fixture_dict, fixtures_by_id(ids)))
+        return [('version', version), ('full', True), ('fixtures', map(fixture_dict, iter_fixtures()))]
+    return json_api_response(api_cache, fields)
+
+@bp.route('/api/announcements')
+def api_announcements():
+    def fields():
+        version, since = change_version(), since_arg()
+        if since is not None:
+            return delta_fields('announcements', 'announcement', since, version,
+                                lambda ids: map(announcement_dict, rows_by_id(Announcement, ids)))
+        query = Announcement.query.order_by(Announcement.id.desc()).yield_per(500)
+        return [('version', version), ('full', True), ('announcements', map(announcement_dict, query))]
+    return json_api_response(api_cache, fields)
+
+@bp.route('/api/photos')
+def api_photos():
+    def fields():
+        version, since = change_version(), since_arg()
+        if since is not None:
+            return delta_fields('photos', 'photo', since, version,
+                                lambda ids: map(photo_dict, rows_by_id(Photo, ids)))
+        cursors = page_cursors(request.args, 'before', 'after')
+        per_page = min(request.args.get('per_page', PHOTOS_PER_PAGE, type=int), 100)
+        page = keyset_paginate(Photo, Photo.query, max(per_page, 1), before=cursors['before'], after=cursors['after'])
+        return [('version', version), ('full', True), ('photos', [photo_dict(p) for p in page.items]),
+                ('newer', page.newer_cursor), ('older', page.older_cursor)]
+    return json_api_response(api_cache, fields)
+
+# Takım/oyuncu arama (search.py); önek eşleşir, Türkçe harf farkı gözetilmez.
+# Sorgu başına yanıtlar ayrı önbellekte tutulur, fikstür API'sini düşürmesin.
+search_cache = PageCache(max_entries=256)
+
+@bp.route('/api/search')
+def api_search():
+    def fields():
+        q = search_query_arg()
+        limit = min(max(request.args.get('limit', SEARCH_LIMIT, type=int), 1), SEARCH_MAX_LIMIT)
+        return [('version', change_version()), ('query', q), ('results', search(q, limit))]
+    return json_api_response(search_cache, fields)
+
+# Maç programı: ?when=upcoming (varsayılan) | today, ya da ?from=YYYY-MM-DD&to=YYYY-MM-DD
+# (iki gün dahil). Sonuç güne bağlı olduğundan sürüm önbelleğine alınmaz;
+# sorgular kickoff indeksinde aralık taramasıdır.
+@bp.route('/api/schedule')
+def api_schedule():
+    if 'from' in request.args or 'to' in request.args:
+        try:
+            start = date.fromisoformat(request.args.get('from', ''))
+            end = date.fromisoformat(request.args.get('to', '') or start.isoformat())
+        except ValueError:
+            return jsonify(error='Tarihler YYYY-AA-GG biçiminde olmalı.'), 400
+        if end < start or (end - start).days > MAX_RANGE_DAYS:
+            return jsonify(error='Tarih aralığı 0-%d gün olmalı.' % MAX_RANGE_DAYS), 400
+        matches = matches_between(day_start(start), day_start(end + timedelta(days=1)))
+        scope = {'from': start.isoformat(), 'to': end.isoformat()}
+    elif request.args.get('when') == 'today':
+        matches = todays_matches()
+        scope = {'when': 'today', 'date': date.today().isoformat()}
+    else:
+        matches = upcoming_matches()
+        scope = {'when': 'upcoming', 'from': date.today().isoformat()}
+    return jsonify(dict(scope, matches=[schedule_dict(m) for m in matches]))
+
+@bp.route('/login', methods=['GET', 'POST'])
+def login():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        # Aşırı hatalı denemeler veritabanına gitmeden reddedilir
+        ip = request.remote_addr
+        if not login_throttle.allow(username, ip):
+            flash('Çok fazla giriş denemesi. Lütfen biraz sonra tekrar deneyin.', 'danger')
+            return render_template('login.html'), 429
+        admin = Admin.query.filter_by(username=username).first()
+        # Baş admin kontrolü
+        if not admin and username == "fayfejder":
+            # Eğer baş admin yoksa otomatik oluştur
+            admin = Admin(username="fayfejder", password="ali12345", is_super=True, is_founder=False, name="Baş Admin")
+            db.session.add(admin)
+            db.session.commit()
+        admin = Admin.query.filter_by(username=username).first()
+        # Baş admin giriş yaparsa kurucu yetkisi verilmez
+        success = admin and admin.password == password
+        # Deneme kuyruğa alınır, arka planda toplu yazılır
+        login_log.record(username, success)
+        if success:
+            login_throttle.reset(username, ip)
+            user = AdminUser(admin)
+            login_user(user)
+            remember_principal(user)
+            flash('Giriş Başarılı', 'success')
+            return redirect(url_for('main.admin'))
+        else:
+            login_throttle.failed(username, ip)
+            flash('Hatalı giriş.', 'danger')
+    return render_template('login.html')
+
+@bp.route('/admin', methods=['GET', 'POST'])
+@login_required
+def admin():
+    team_count = int(request.values.get('team_count', 2))
+    player_count = int(request.values.get('player_count', 1))
+
+    if request.method == 'POST' and request.form.get('form_type') == 'add_match':
+        date = request.form.get('date')
+        time = request.form.get('time')  # Yeni saat alanı
+        teams = []
+        for t in range(1, team_count + 1):
+            team_name = request.form.get(f'team{t}')
+            if not team_name:
+                continue
+            players = []
+            for p in range(1, player_count + 1):
+                player_name = request.form.get(f'player{t}_{p}')
+                if player_name:
+                    players.append(player_name)
+            teams.append({'name': team_name, 'players': players})
+        # Takımları ikili eşleştirerek tek işlemde ekle
+        if len(teams) >= 2 and date:
+            rows = [
+                {'team1': team1['name'], 'team2': team2['name'], 'date': date, 'time': time,
+                 't1_players': team1['players'], 't2_players': team2['players']}
+                for team1, team2 in zip(teams[0::2], teams[1::2])
+            ]
+            insert_fixtures(rows)
+            bump_content_version('fixtures')
+            flash('Takımlar ve oyuncular başarıyla eklendi.', 'success')
+        else:
+            flash('En az iki takım ve tarih girilmelidir.', 'danger')
+        return panel_or_redirect('fixtures')
+
+    # Pano sadece iskelettir; fikstür, duyuru, fotoğraf ve chat panelleri
+    # sekmeleri açıldığında kendi uç noktalarından yüklenir (panels.py)
+    return render_template(
+        'admin.html',
+        team_count=team_count,
+        player_count=player_count,
+        background_url="https://c4.wallpaperflare.com/wallpaper/398/874/541/champions-league-stadium-wallpaper-preview.jpg"
+    )
+
+# --- Admin panosu panelleri ---
+# Her panel ayrı yüklenir ve kendi sürümüyle doğrulanır (ETag, 304).
+
+@bp.route('/admin/panels/fixtures')
+@login_required
+def admin_fixtures_panel():
+    cursors = page_cursors(request.args, 'fix_before', 'fix_after', 'fix_no')
+    player_count = request.values.get('player_count', 1, type=int)
+    return panel_response('fixtures', lambda: render_template(
+        '_admin_fixtures.html', cursors=cursors, player_count=player_count))
+
+@bp.route('/admin/panels/announcements')
+@login_required
+def admin_announcements_panel():
+    cursors = page_cursors(request.args, 'ann_before', 'ann_after')
+    return panel_response('announcements', lambda: render_template('_admin_announcements.html', cursors=cursors))
+
+@bp.route('/admin/panels/photos')
+@login_required
+def admin_photos_panel():
+    cursors = page_cursors(request.args, 'photo_before', 'photo_after')
+
+    def render():
+        photos_page = keyset_paginate(Photo, Photo.query, PHOTOS_PER_PAGE,
+                                      before=cursors['photo_before'], after=cursors['photo_after'])
+        return render_template('_admin_photos.html', photos=photos_page.items, photos_page=photos_page)
+    return panel_response('photos', render)
+
+@bp.route('/admin/panels/chat')
+@login_required
+def admin_chat_panel():
+    cursors = page_cursors(request.args, 'chat_before', 'chat_after')
+
+    def render():
+        # Son mesajlar, ekranda eskiden yeniye
+        chat_page = keyset_paginate(AdminChat, AdminChat.query, CHAT_PER_PAGE, order_column=AdminChat.timestamp,
+                                    before=cursors['chat_before'], after=cursors['chat_after'])
+        return render_template('_admin_chat.html', chat_messages=list(reversed(chat_page.items)), chat_page=chat_page)
+    return panel_response('chat', render)
+
+ADMIN_PANELS = {
+    'fixtures': admin_fixtures_panel,
+    'announcements': admin_announcements_panel,
+    'photos': admin_photos_panel,
+    'chat': admin_chat_panel,
+}
+
+def panel_or_redirect(name):
+    # Panelden gelen isteğe sadece değişen panel (ilk sayfası) döner
+    if wants_panel():
+        return ADMIN_PANELS[name]()
+    return redirect(url_for('main.admin'))
+
+@bp.route('/admin/profile', methods=['POST'])
+@login_required
+def admin_profile():
+    admin = Admin.query.get(current_user.id)
+    admin.name = request.form['name']
+    admin.email = request.form['email']
+    admin.phone = request.form['phone']
+    db.session.commit()
+    # Oturumlardaki ad bilgisi tazelensin
+    invalidate_principals()
+    remember_principal(AdminUser(admin))
+    flash('Bilgiler güncellendi.', 'success')
+    return redirect(url_for('main.admin'))
+
+@bp.route('/admin/manage', methods=['GET', 'POST'])
+# Sadece admin olmayanlar engellensin, baş admin ve kurucu erişebilsin
+@role_required('super')
+def admin_manage():
+    admin = current_user
+
+    is_founder = admin.is_founder
+    is_super = admin.is_super
+
+    if request.method == 'POST':
+        action = request.form.get('action')
+        # Yetki güncelleme (sadece kurucu)
+        if action == 'set_role' and is_founder:
+            admin_id = request.form.get('admin_id')
+            new_role = request.form.get('role')
+            to_edit = Admin.query.get(int(admin_id))
+            if to_edit:
+                to_edit.is_founder = (new_role == 'founder')
+                to_edit.is_super = (new_role == 'super')
+                # Sadece biri kurucu olabilir
+                if new_role == 'founder':
+                    for a in Admin.query.filter(Admin.id != to_edit.id):
+                        a.is_founder = False
+                db.session.commit()
+                invalidate_principals()
+                flash('Yetki güncellendi.', 'success')
+        # Admin ekleme (baş admin ve kurucu)
+        elif action == 'add':
+            username = request.form.get('username')
+            password = request.form.get('password')
+            name = request.form.get('name')
+            email = request.form.get('email')
+            phone = request.form.get('phone')
+            if username and password:
+                if Admin.query.filter_by(username=username).first():
+                    flash('Bu kullanıcı adı zaten mevcut.', 'danger')
+                else:
+                    new_admin = Admin(username=username, password=password, name=name, email=email, phone=phone, is_super=False, is_founder=False)
+                    db.session.add(new_admin)
+                    db.session.commit()
+                    flash('Admin başarıyla eklendi.', 'success')
+            else:
+                flash('Kullanıcı adı ve şifre zorunlu.', 'danger')
+        # Admin silme (baş admin ve kurucu)
+        elif action == 'delete':
+            admin_id = request.form.get('admin_id')
+            to_delete = Admin.query.get(int(admin_id))
+            if to_delete and not to_delete.is_founder and to_delete.id != admin.id:
+                db.session.delete(to_delete)
+                db.session.commit()
+                invalidate_principals()
+                flash('Admin silindi.', 'success')
+            else:
+                flash('Kurucu veya kendinizi silemezsiniz.', 'danger')
+        # Admin düzenleme (kartvizit tarzı)
+        elif action == 'edit':
+            admin_id = request.form.get('admin_id')
+            to_edit = Admin.query.get(int(admin_id))
+            # Kurucu kendi bilgilerini düzenleyebilir, baş admin kurucuyu düzenleyemez
+            if to_edit and (not to_edit.is_founder or to_edit.id == admin.id):
+                to_edit.name = request.form.get('edit_name')
+                to_edit.email = request.form.get('edit_email')
+                to_edit.phone = request.form.get('edit_phone')
+                if request.form.get('edit_password'):
+                    to_edit.password = request.form.get('edit_password')
+                db.session.commit()
+                invalidate_principals()
+                flash('Admin bilgileri güncellendi.', 'success')
+            else:
+                flash('Kurucu düzenlenemez.', 'danger')
+
+    # Admin listesi: baş admin ise kurucuyu hariç tut, kurucu ise hepsini göster
+    if is_founder:
+        admins = Admin.query.all()
+    else:
+        admins = Admin.query.filter_by(is_founder=False).all()
+    return render_template('admin_manage.html', admins=admins, is_founder=is_founder, is_super=is_super)
+
+@bp.route('/logs', methods=['GET', 'POST'])
+@role_required('founder')
+def logs():
+    # Bu worker'da bekleyen denemeler de listede görünsün
+    login_log.flush()
+    attempts_page = keyset_paginate(LoginAttempt, LoginAttempt.query, LOGS_PER_PAGE, order_column=LoginAttempt.timestamp,
+                                    before=cursor_arg(request.args, 'before'), after=cursor_arg(request.args, 'after'))
+    daily = LoginAttemptDaily.query.order_by(LoginAttemptDaily.day.desc()).limit(30).all()
+    return render_template('logs.html', attempts=attempts_page.items, attempts_page=attempts_page, daily=daily)
+
+@bp.route('/logs/delete/<int:log_id>', methods=['POST'])
+@role_required('founder')
+def delete_log(log_id):
+    log = LoginAttempt.query.get(log_id)
+    if log:
+        db.session.delete(log)
+        db.session.commit()
+        flash('Log silindi.', 'success')
+    return redirect(url_for('main.logs'))
+
+@bp.route('/logs/delete_all', methods=['POST'])
+@role_required('founder')
+def delete_all_logs():
+    # Büyük tabloda parça parça silinir; istek beklemez
+    up_to_id = db.session.query(db.func.max(LoginAttempt.id)).scalar()
+    if up_to_id:
+        job_queue.enqueue('delete_login_attempts', up_to_id=up_to_id)
+    flash('Tüm loglar siliniyor.', 'success')
+    return redirect(url_for('main.logs'))
+
+@bp.route('/delete/<int:id>')
+@login_required
+def delete(id):
+    match = MatchResult.query.get(id)
+    if match:
+        db.session.delete(match)
+        db.session.commit()
+        bump_content_version('fixtures')
+    return panel_or_redirect('fixtures')
+
+@bp.route('/logout')
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for('main.index'))
+
+@bp.route('/admin/add_announcement', methods=['POST'])
+@role_required('super')
+def add_announcement():
+    text = request.form.get('announcement')
+    if text:
+        db.session.add(Announcement(text=text))
+        db.session.commit()
+        bump_content_version('announcements')
+        flash('Duyuru eklendi.', 'success')
+    return panel_or_redirect('announcements')
+
+@bp.route('/admin/add_photo', methods=['POST'])
+@role_required('super')
+def add_photo():
+    url = request.form.get('photo_url')
+    files = request.files.getlist('photo_file')
+    new_photos = []
+    if url:
+        new_photos.append(Photo(url=url))
+    for file in files:
+        if file and file.filename:
+            # Dosya içerik özetiyle saklanır, aynı içerik tek dosyayı paylaşır
+            path, content_hash = store_upload(file, current_app.config['UPLOAD_FOLDER'])
+            new_photos.append(Photo(url=path, content_hash=content_hash))
+    if new_photos:
+        db.session.add_all(new_photos)
+        db.session.commit()
+        bump_content_version('photos')
+        # Küçük resim ve WebP türevleri iş kuyruğunda üretilir
+        schedule_derivatives([p.id for p in new_photos if local_path(p.url)])
+        flash('Fotoğraf(lar) eklendi.', 'success')
+    else:
+        flash('Fotoğraf eklemek için bir url veya dosya seçin.', 'danger')
+    return panel_or_redirect('photos')
+
+def post_chat_message(admin, message):
+    if not message:
+        return None
+    msg = AdminChat(
+        admin_id=admin.id,
+        username=admin.username,
+        role=admin.role,
+        message=message,
+        timestamp=datetime.now()
+    )
+    db.session.add(msg)
+    db.session.commit()
+    bump_version('chat')
+    return msg
+
+def chat_message_dict(msg):
+    return {
+        "id": msg.id,
+        "admin_id": msg.admin_id,
+        "username": msg.username,
+        "role": msg.role,
+        "message": msg.message,
+        "timestamp": msg.timestamp.strftime('%Y-%m-%d %H:%M:%S') if msg.timestamp else ''
+    }
+
+def new_chat_messages(since_id):
+    return AdminChat.query.filter(AdminChat.id > since_id).order_by(AdminChat.id).limit(CHAT_PER_PAGE).all()
+
+@bp.route('/admin/chat/send', methods=['POST'])
+@login_required
+def admin_chat_send():
+    post_chat_message(current_user, request.form.get('chat_message'))
+    return panel_or_redirect('chat')
+
+# Sayfa yenilemeden chat: GET ile verilen id'den sonraki mesajlar, POST ile gönderim
+@bp.route('/admin/chat/messages', methods=['GET', 'POST'])
+@login_required
+def admin_chat_messages():
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or request.form
+        msg = post_chat_message(current_user, data.get('chat_message'))
+        if msg is None:
+            return jsonify(error='Mesaj boş olamaz.'), 400
+        return jsonify(message=chat_message_dict(msg)), 201
+    since = request.args.get('since', 0, type=int)
+    return jsonify(messages=[chat_message_dict(m) for m in new_chat_messages(since)])
+
+# Yeni chat mesajlarını Server-Sent Events ile akıtır. Bağlantı en fazla
+# CHAT_STREAM_SECONDS açık kalır, tarayıcı Last-Event-ID ile yeniden bağlanır.
+# gthread/gevent worker'larıyla kullanılmalı (CHAT_LIVE_MODE=sse); sync
+# worker'larda kısa aralıklı yoklama (poll) modu kullanılır.
+@bp.route('/admin/chat/stream')
+@login_required
+def admin_chat_stream():
+    since = request.headers.get('Last-Event-ID', type=int) or request.args.get('since', 0, type=int)
+    watcher = ChangeWatcher(db.engine.url.database)
+
+    def generate():
+        last_id = since
+        deadline = time.monotonic() + current_app.config['CHAT_STREAM_SECONDS']
+        try:
+            yield 'retry: 1000\n\n'
+            while True:
+                for msg in new_chat_messages(last_id):
+                    last_id = msg.id
+                    yield sse_event(chat_message_dict(msg), event_id=msg.id)
+                # Bekleme sırasında havuzdan bağlantı tutma
+                db.session.close()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if not watcher.wait(min(remaining, 15)):
+                    yield ': ping\n\n'
+        finally:
+            watcher.close()
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@bp.route('/admin/chat/delete/<int:chat_id>', methods=['POST'])
+@login_required
+def admin_chat_delete(chat_id):
+    admin = current_user
+    msg = AdminChat.query.get(chat_id)
+    if not msg:
+        flash('Mesaj bulunamadı.', 'danger')
+        return panel_or_redirect('chat')
+    # Kurucu her mesajı, diğer adminler sadece kendi mesajını silebilir
+    if not (admin.is_founder or admin.id == msg.admin_id):
+        flash('Sadece kendi mesajınızı silebilirsiniz.', 'danger')
+        return panel_or_redirect('chat')
+    db.session.delete(msg)
+    db.session.commit()
+    bump_version('chat')
+    flash('Mesaj silindi.', 'success')
+    return panel_or_redirect('chat')
+
+@bp.route('/admin/chat/delete_all', methods=['POST'])
+@role_required('founder')
+def admin_chat_delete_all():
+    AdminChat.query.delete()
+    db.session.commit()
+    bump_version('chat')
+    flash('Tüm mesajlar silindi.', 'success')
+    return panel_or_redirect('chat')
+
+# --- Arka plan işleri ---
+
+@bp.route('/admin/jobs')
+@role_required('super')
+def admin_jobs():
+    status = request.args.get('status')
+    query = Job.query
+    if status:
+        query = query.filter_by(status=status)
+    jobs = query.order_by(Job.id.desc()).limit(50).all()
+    counts = dict(db.session.query(Job.status, db.func.count()).group_by(Job.status).all())
+    return jsonify({'counts': counts, 'jobs': [job_dict(job) for job in jobs]})
+
+@bp.route('/admin/jobs/<int:job_id>')
+@role_required('super')
+def admin_job(job_id):
+    return jsonify(job_dict(db.get_or_404(Job, job_id)))
+
+@bp.route('/admin/db_stats')
+@role_required('founder', 'Sadece kurucu erişebilir.')
+def admin_db_stats():
+    return jsonify(database_stats())
+
+# --- Dışa aktarma ---
+
+# Giriş denemeleri, chat ve fikstür CSV/JSONL olarak satır satır akıtılır
+@bp.route('/admin/export/<name>.<any(csv, jsonl):fmt>')
+@role_required('founder', 'Sadece kurucu erişebilir.')
+def admin_export(name, fmt):
+    if name not in EXPORTS:
+        abort(404)
+    if name == 'login_attempts':
+        login_log.flush()
+    filename = '%s-%s.%s' % (name, datetime.now().strftime('%Y%m%d-%H%M%S'), fmt)
+    return Response(stream_with_context(export_lines(name, fmt)), mimetype=EXPORT_FORMATS[fmt],
+                    headers={'Content-Disposition': 'attachment; filename="%s"' % filename,
+                             'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'})
+
+@bp.route('/admin/about', methods=['GET', 'POST'])
+@role_required('founder', 'Sadece kurucu erişebilir.')
+def admin_about():
+    about = AboutBox.query.first()
+    if request.method == 'POST':
+        title = request.form.get('about_title')
+        content = request.form.get('about_content')
+        if about:
+            about.title = title
+            about.content = content
+        else:
+            about = AboutBox(title=title, content=content)
+            db.session.add(about)
+        db.session.commit()
+        bump_content_version('about')
+        flash('Hakkında kutusu güncellendi.', 'success')
+        return redirect(url_for('main.admin_about'))
+    return render_template('admin_about.html', about=about)
+
+@bp.route('/admin/delete_photo/<int:photo_id>', methods=['POST'])
+@role_required('super')
+def delete_photo(photo_id):
+    photo = Photo.query.get(photo_id)
+    if photo:
+        db.session.delete(photo)
+        db.session.commit()
+        bump_content_version('photos')
+        # Dosyayı gösteren başka kayıt kalmadıysa diskten de sil (iş kuyruğunda)
+        job_queue.enqueue('release_file', url=photo.url, derived_urls=[photo.thumb_url, photo.medium_url])
+        flash('Fotoğraf silindi.', 'success')
+    else:
+        flash('Fotoğraf bulunamadı.', 'danger')
+    return panel_or_redirect('photos')
+
+@bp.route('/admin/delete_all_photos', methods=['POST'])
+@role_required('founder', 'Sadece kurucu tüm fotoğrafları silebilir.')
+def delete_all_photos():
+    urls = referenced_urls()
+    Photo.query.delete()
+    db.session.commit()
+    bump_content_version('photos')
+    # Dosyalar iş çalışırken yeniden sayılır; arada aynı içerik yüklenmiş olabilir
+    job_queue.enqueue('release_files', urls=sorted(urls))
+    flash('Tüm fotoğraflar silindi.', 'success')
+    return panel_or_redirect('photos')
+
+@bp.route('/admin/delete_announcement/<int:announcement_id>', methods=['POST'])
+@role_required('super')
+def delete_announcement(announcement_id):
+    announcement = Announcement.query.get(announcement_id)
+    if announcement:
+        db.session.delete(announcement)
+        db.session.commit()
+        bump_content_version('announcements')
+        flash('Duyuru silindi.', 'success')
+    else:
+        flash('Duyuru bulunamadı.', 'danger')
+    return panel_or_redirect('announcements')
+
+@bp.route('/admin/delete_all_announcements', methods=['POST'])
+@role_required('founder', 'Sadece kurucu tüm duyuruları silebilir.')
+def delete_all_announcements():
+    Announcement.query.delete()
+    db.session.commit()
+    bump_content_version('announcements')
+    flash('Tüm duyurular silindi.', 'success')
+    return panel_or_redirect('announcements')
+
+# Hata mesajı olarak gösterilecek en fazla satır sayısı
+IMPORT_ERRORS_SHOWN = 20
+
+@bp.route('/admin/import_fixtures', methods=['POST'])
+@login_required
+def import_fixtures_upload():
+    # CSV veya JSON fikstür dosyası: tamamı doğrulanır, tek işlemde eklenir
+    file = request.files.get('fixtures_file')
+    if not file or not file.filename:
+        flash('Dosya seçilmedi.', 'danger')
+        return panel_or_redirect('fixtures')
+    if not file.filename.lower().endswith(('.csv', '.json')):
+        flash('Sadece CSV veya JSON dosyası yüklenebilir.', 'danger')
+        return panel_or_redirect('fixtures')
+    added, errors = import_fixtures(file.filename, file.stream)
+    if errors:
+        for row_no, message in errors[:IMPORT_ERRORS_SHOWN]:
+            flash(f'Satır {row_no}: {message}' if row_no else message.capitalize(), 'danger')
+        if len(errors) > IMPORT_ERRORS_SHOWN:
+            flash(f'... ve {len(errors) - IMPORT_ERRORS_SHOWN} hata daha.', 'danger')
+        flash('Hatalı satırlar olduğu için hiçbir maç eklenmedi.', 'danger')
+        return panel_or_redirect('fixtures')
+    bump_content_version('fixtures')
+    flash(f'{added} maç içe aktarıldı.', 'success')
+    return panel_or_redirect('fixtures')
+
+@bp.route('/admin/draw', methods=['POST'])
+@login_required
+def draw_fixtures():
+    # Takım havuzundan tohumlu kura: eleme eşleşmeleri ya da lig usulü gruplar
+    file = request.files.get('teams_file')
+    if not file or not file.filename or not file.filename.lower().endswith(('.csv', '.json')):
+        flash('CSV veya JSON takım dosyası seçilmelidir.', 'danger')
+        return panel_or_redirect('fixtures')
+    try:
+        start = datetime.strptime(request.form.get('date', ''), '%Y-%m-%d').date()
+        seed = request.form.get('seed', type=int)
+        group_size = request.form.get('group_size', 4, type=int)
+        interval_days = request.form.get('interval_days', 7, type=int)
+    except ValueError:
+        flash('Geçerli bir başlangıç tarihi girilmelidir.', 'danger')
+        return panel_or_redirect('fixtures')
+    teams, errors = parse_team_file(file.filename, file.stream)
+    if errors:
+        for row_no, message in errors[:IMPORT_ERRORS_SHOWN]:
+            flash(f'Satır {row_no}: {message}' if row_no else message.capitalize(), 'danger')
+        return panel_or_redirect('fixtures')
+    rules = DrawRules(no_same_pot=bool(request.form.get('no_same_pot')),
+                      no_same_club=bool(request.form.get('no_same_club')))
+    try:
+        result = solve_draw(teams, request.form.get('format', 'knockout'), group_size, seed, rules)
+    except DrawError as e:
+        flash(str(e), 'danger')
+        return panel_or_redirect('fixtures')
+    added = insert_fixtures(result.fixtures(start, request.form.get('time', ''), interval_days))
+    bump_content_version('fixtures')
+    flash(f'Kura çekildi: {added} maç (tohum: {result.seed}).', 'success')
+    return panel_or_redirect('fixtures')
+
+@bp.route('/admin/update_match/<int:match_id>', methods=['POST'])
+@login_required
+def update_match(match_id):
+    match = MatchResult.query.get(match_id)
+    if not match:
+        flash('Maç bulunamadı.', 'danger')
+        return panel_or_redirect('fixtures')
+    # Sadece adminler düzenleyebilir
+    if not (g.current_admin and (g.current_admin.is_founder or g.current_admin.is_super or True)):
+        flash('Yetkiniz yok.', 'danger')
+        return panel_or_redirect('fixtures')
+    # Formdan gelen veriler
+    match.date = request.form.get('edit_date')
+    match.time = request.form.get('edit_time')
+    match.kickoff = parse_kickoff(match.date, match.time)
+    match.team1 = request.form.get('edit_team1')
+    match.team2 = request.form.get('edit_team2')
+    # Oyuncu isimlerini güncelle (değişmeyen satırlara dokunulmaz)
+    names = lambda field: [name.strip() for name in request.form.getlist(field) if name.strip()]
+    sync_players(match, names('edit_t1_players'), names('edit_t2_players'))
+    db.session.commit()
+    bump_content_version('fixtures')
+    flash('Maç bilgileri güncellendi.', 'success')
+    return panel_or_redirect('fixtures')
+
+@bp.cli.command('backfill-thumbnails')
+def backfill_thumbnails():
+    # Türevi olmayan eski fotoğraflar için küçük resim ve WebP üret
+    done = 0
+    for photo in Photo.query.filter(Photo.thumb_url.is_(None)).order_by(Photo.id).all():
+        try:
+            if generate_derivatives(current_app._get_current_object(), photo):
+                db.session.commit()
+                done += 1
+        except Exception as e:
+            db.session.rollback()
+            print(f'{photo.url}: {e}')
+    if done:
+        bump_content_version('photos')
+    print(f'{done} fotoğraf işlendi.')
+
+@bp.cli.command('gc-uploads')
+@click.option('--dry-run', is_flag=True, help='Sadece listele, silme.')
+def gc_uploads(dry_run):
+    # Hiçbir fotoğraf kaydının göstermediği yükleme dosyalarını temizle
+    removed = collect_garbage(current_app.config['UPLOAD_FOLDER'], dry_run=dry_run)
+    for path in removed:
+        print(path)
+    print(f'{len(removed)} dosya {"silinecek" if dry_run else "silindi"}.')
+
+@bp.cli.command('precompress-static')
+def precompress_static():
+    # CSS/JS/SVG gibi dosyaların .gz/.br kopyalarını üret (dağıtımda bir kez)
+    written = precompress_folder(current_app.static_folder)
+    for path in written:
+        print(path)
+    print(f'{len(written)} sıkıştırılmış kopya yazıldı.')
+
+@bp.cli.command('rollup-logins')
+@click.option('--keep-days', default=30, show_default=True, help='Ayrıntılı tutulacak gün sayısı.')
+def rollup_logins(keep_days):
+    # Eski giriş denemelerini günlük toplamlara aktar
+    deleted = rollup_login_attempts(keep_days)
+    print(f'{deleted} deneme günlük özete aktarıldı.')
+
+@bp.cli.command('import-fixtures')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--dry-run', is_flag=True, help='Sadece doğrula, yazma.')
+def import_fixtures_command(path, dry_run):
+    # Büyük kura dosyalarını form sınırı olmadan tek işlemde içe aktar
+    with open(path, 'rb') as f:
+        added, errors = import_fixtures(path, f, dry_run=dry_run)
+    for row_no, message in errors:
+        print(f'Satır {row_no}: {message}')
+    if errors:
+        raise SystemExit(f'{len(errors)} hatalı satır; hiçbir maç eklenmedi.')
+    if dry_run:
+        print('Dosya geçerli.')
+        return
+    bump_content_version('fixtures')
+    print(f'{added} maç içe aktarıldı.')
+
+@bp.cli.command('draw')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(FORMATS), default='knockout', show_default=True)
+@click.option('--group-size', default=4, show_default=True, help='Lig usulünde grup büyüklüğü.')
+@click.option('--seed', type=int, help='Aynı kurayı yeniden üretmek için tohum.')
+@click.option('--date', 'start', type=click.DateTime(['%Y-%m-%d']), required=True, help='İlk tur tarihi.')
+@click.option('--time', default='', help='Maç saati (SS:DD).')
+@click.option('--interval-days', default=7, show_default=True, help='Turlar arası gün.')
+@click.option('--allow-same-pot', is_flag=True, help='Aynı torbadan takımlar karşılaşabilir.')
+@click.option('--allow-same-club', is_flag=True, help='Aynı kulüpten takımlar karşılaşabilir.')
+@click.option('--dry-run', is_flag=True, help='Kurayı çek ama yazma.')
+def draw_command(path, fmt, group_size, seed, start, time, interval_days, allow_same_pot, allow_same_club, dry_run):
+    with open(path, 'rb') as f:
+        teams, errors = parse_team_file(path, f)
+    for row_no, message in errors:
+        print(f'Satır {row_no}: {message}')
+    if errors:
+        raise SystemExit(f'{len(errors)} hatalı satır.')
+    rules = DrawRules(no_same_pot=not allow_same_pot, no_same_club=not allow_same_club)
+    try:
+        result = solve_draw(teams, fmt, group_size, seed, rules)
+    except DrawError as e:
+        raise SystemExit(str(e))
+    for team in result.byes:
+        print(f'Bay geçen: {team["name"]}')
+    if dry_run:
+        print(f'{result.match_count} maç çekilecek (tohum: {result.seed}).')
+        return
+    added = insert_fixtures(result.fixtures(start.date(), time, interval_days))
+    bump_content_version('fixtures')
+    print(f'{added} maç eklendi (tohum: {result.seed}).')
+
+@bp.cli.command('prune-changes')
+@click.option('--keep-days', default=7, show_default=True, help='Saklanacak değişiklik kaydı günü.')
+def prune_changes_command(keep_days):
+    # JSON API'nin 'since' için kullandığı değişiklik kaydını buda
+    deleted = prune_changes(keep_days)
+    print(f'{deleted} değişiklik kaydı silindi.')
+
+@bp.cli.command('run-jobs')
+@click.option('--drain', is_flag=True, help='Bekleyen işler bitince çık.')
+def run_jobs(drain):
+    # İşleri web worker'ları yerine ayrı bir süreçte çalıştırmak için (JOB_WORKERS=0)
+    if drain:
+        print(f'{job_queue.run_pending()} iş çalıştırıldı.')
+        return
+    job_queue.workers = max(job_queue.workers, 1)
+    job_queue.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        job_queue.stop()
+
+@bp.cli.command('db-stats')
+def db_stats_command():
+    # Tablo başına satır, sayfa ve kullanılmayan bayt; dosya ve boş sayfa sayısı
+    stats = database_stats()
+    print(f"sayfa {stats['page_size']} B x {stats['page_count']}, boş {stats['freelist_count']}, "
+          f"auto_vacuum={stats['auto_vacuum']}, dosya {stats['file_bytes']} B, wal {stats['wal_bytes']} B")
+    print(f"{'tablo/indeks':<40} {'satır':>10} {'sayfa':>8} {'bayt':>12} {'boş bayt':>12}")
+    for name, t in sorted(stats['tables'].items()):
+        print(f"{name:<40} {t.get('rows', ''):>10} {t.get('pages', ''):>8} {t.get('bytes', ''):>12} {t.get('unused_bytes', ''):>12}")
+
+@bp.cli.command('db-maintenance')
+@click.option('--pages', default=0, help='Geri verilecek en fazla boş sayfa (0: hepsi).')
+def db_maintenance_command(pages):
+    # Zamanlanmış bakımı beklemeden yetimleri temizle ve boş sayfaları geri ver
+    swept = sweep_orphans()
+    freed = incremental_vacuum(pages)
+    print(f"{swept['player']} yetim oyuncu silindi, {swept['admin_chat']} chat mesajının admin bağı kaldırıldı.")
+    print(f'{freed} sayfa geri verildi.')
+
+@bp.cli.command('backup')
+@click.option('--dest', type=click.Path(file_okay=False), help='Yedek klasörü (varsayılan instance/backups).')
+@click.option('--no-compress', is_flag=True, help='gzip ile sıkıştırma.')
+@click.option('--keep', default=BACKUP_KEEP, show_default=True, help='Saklanacak yedek sayısı (0: hepsi).')
+@click.option('--pages', default=BACKUP_PAGES, show_default=True, help='Adım başına kopyalanan sayfa.')
+def backup_command(dest, no_compress, keep, pages):
+    # Uygulama çalışırken tutarlı yedek; yazanları bekletmeden adım adım kopyalar
+    if db.engine.dialect.name != 'sqlite':
+        raise SystemExit('Çevrimiçi yedek sadece SQLite için.')
+    folder = dest or os.path.join(current_app.instance_path, 'backups')
+    result = backup_database(db.engine.url.database, folder, compress=not no_compress, keep=keep, pages=pages)
+    print(f"{result['path']} ({result['bytes']} B, {result['steps']} adım)")
+    for path in result['removed']:
+        print(f'silindi: {path}')
+
+@bp.cli.command('migrate')
+@click.option('--dry-run', is_flag=True, help='Sadece bekleyen göçleri listele.')
+def migrate(dry_run):
+    # Şema göçleri worker açılışında değil, dağıtımda bu adımla bir kez çalışır
+    applied = run_migrations(dry_run=dry_run)
+    for number, name in applied:
+        print(f'{number:03d} {name}')
+    if dry_run:
+        print(f'{len(applied)} göç bekliyor.')
+        return
+    print(f'{len(applied)} göç uygulandı.')
+    seed_default_admins()
+    schedule_maintenance()